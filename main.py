@@ -4,7 +4,7 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.edge.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException, TimeoutException, StaleElementReferenceException
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, StaleElementReferenceException, WebDriverException
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.keys import Keys
 from rich.console import Console
@@ -15,15 +15,30 @@ import chess.engine
 import os
 import re
 import sys
-import subprocess
+import shutil
 import json
+import math
+import hashlib
 import random
+import functools
+from collections import OrderedDict, defaultdict
 from dataclasses import dataclass
 import threading
+import queue
 import yaml
 import msvcrt
-import tkinter as tk
-from settings_gui import create_settings_window, ChessSettingsGUI
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    # Optional: without watchdog the settings watcher falls back to polling
+    Observer = None
+    FileSystemEventHandler = object
+import settings_gui
+
+# Use the LibYAML C loader/dumper when PyYAML was built with it
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
 
 @dataclass
 class LegitModeSettings:
@@ -35,13 +50,23 @@ class LegitModeSettings:
     elo_variance: int = 200           # How much ELO effectively varies
 
 
+@functools.lru_cache(maxsize=32)
+def hex_to_rgba(hex_color):
+    """Convert a '#rrggbb' color to the rgba() string used for arrows"""
+    r, g, b = bytes.fromhex(hex_color[1:7])
+    return f"rgba({r}, {g}, {b}, 0.8)"
+
+def settings_digest(data):
+    """Digest of the settings file bytes, used to skip contents that were already applied"""
+    return hashlib.blake2b(data, digest_size=8).digest()
+
 # Parse command line arguments
 def parse_arguments():
     # Load config from YAML file
     config_path = 'config.yaml'
     try:
         with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=YAML_LOADER)
     except Exception as e:
         console.print(f"[red]Error loading config file: {e}[/red]")
         return None
@@ -56,23 +81,78 @@ def parse_arguments():
             self.legit_mode = config.get('legit_mode', True)
             self.blunder_chance = config.get('blunder_chance', 0.15)
             self.suboptimal_chance = config.get('suboptimal_chance', 0.35)
-            self.settings_file = None  # Not used when using YAML config
+            # Verbose per-tick diagnostics; CHESSBOT_DEBUG=1 turns them on without editing the config
+            self.config_debug = config.get('debug', False)
+            self.debug = self.config_debug or os.environ.get('CHESSBOT_DEBUG') == '1'
+            self.poll_interval = config.get('poll_interval', 0.1)  # Base monitor poll interval (seconds)
+            self.tt_size = config.get('tt_size', 4096)  # Positions kept in the analysis cache
+            self.debugger_address = config.get('debugger_address')  # e.g. 127.0.0.1:9222 to attach to a running Edge
+            self.edge_profile_dir = config.get('edge_profile_dir')  # Persistent Edge profile; None uses a fresh one per launch
+            self.settings_file = config_path  # Watched so edits apply without a restart
+            self.listeners = []  # Called after settings change outside the GUI
+            self.lock = settings_lock  # Held while settings are changed together or written to disk
+        
+        def notify(self):
+            """Tell listeners (the settings window) that the settings changed"""
+            for listener in self.listeners:
+                listener()
+        
+        @property
+        def arrow_color(self):
+            return self._arrow_color
+        
+        @arrow_color.setter
+        def arrow_color(self, value):
+            # Keep the rgba() form used for drawing in step with the configured color;
+            # each is a single attribute assignment, so readers never see a half-update
+            if not isinstance(value, str):
+                value = '#0080FF'  # e.g. arrow_color: null in the config; use the default color
+            is_hex = value.startswith('#') and len(value) == 7
+            try:
+                rgba = hex_to_rgba(value) if is_hex else value
+            except ValueError:
+                value = '#0080FF'  # e.g. '#GGGGGG', which bytes.fromhex rejects; use the default color
+                rgba = hex_to_rgba(value)
+            self.arrow_rgba_str = rgba
+            self._arrow_color = value
             
         def save_config(self):
-            config = {
-                'enabled': self.enabled,
-                'side': self.side,
-                'elo': self.elo,
-                'arrow_color': self.arrow_color,
-                'legit_mode': self.legit_mode,
-                'blunder_chance': self.blunder_chance,
-                'suboptimal_chance': self.suboptimal_chance
-            }
-            try:
-                with open('config.yaml', 'w') as f:
-                    yaml.dump(config, f)
-            except Exception as e:
-                console.print(f"[red]Error saving config: {e}[/red]")
+            """Write the settings to config.yaml; returns whether the write succeeded"""
+            global last_settings_hash
+            # The GUI save thread and the monitor thread (hotkeys) both save: one writer at a time,
+            # and the snapshot is taken under the lock so it never mixes two updates
+            with self.lock:
+                config = {
+                    'enabled': self.enabled,
+                    'side': self.side,
+                    'elo': self.elo,
+                    'arrow_color': self.arrow_color,
+                    'legit_mode': self.legit_mode,
+                    'blunder_chance': self.blunder_chance,
+                    'suboptimal_chance': self.suboptimal_chance,
+                    'debug': self.config_debug,  # Never persist the environment override
+                    'poll_interval': self.poll_interval,
+                    'tt_size': self.tt_size,
+                    'debugger_address': self.debugger_address,
+                    'edge_profile_dir': self.edge_profile_dir
+                }
+                try:
+                    # Encode exactly what text mode would write, so the digest matches the file
+                    data = yaml.dump(config, Dumper=YAML_DUMPER).replace('\n', os.linesep).encode()
+                    # The watcher sees our own writes too; record the digest first so
+                    # reload_settings skips them instead of re-applying what we already hold
+                    last_settings_hash = settings_digest(data)
+                    with open('config.yaml', 'wb') as f:
+                        f.write(data)
+                except Exception as e:
+                    last_settings_hash = None
+                    console.print(f"[red]Error saving config: {e}[/red]")
+                    return False
+            
+            # Skipping the reload also skips its disable handling; the main loop clears the arrows
+            if not self.enabled:
+                settings_changed_event.set()
+            return True
 
     return Config(config)
 
@@ -82,18 +162,103 @@ console = Console()
 
 # Global variables
 previous_board_state = {}
+crash_count = 0  # Consecutive monitoring errors
+last_board_fingerprint = None  # Hash of the last fully processed board state
+fingerprinted_state = None  # Board state object last_fingerprint_value was computed from
+last_fingerprint_value = None
+last_move_count = -1  # Number of entries in the move list on the last tick
 current_turn = "white"  # Track whose turn it is
+live_board = chess.Board()  # Persistent board updated incrementally as moves are detected
+last_move_detected_at = 0.0  # time.monotonic() of the last detected move
 last_moves = {"white": None, "black": None}
 evaluation_score = 0.0  # Track the current evaluation
+settings_lock = threading.Lock()  # Serializes settings updates and config.yaml writes across threads
 args = parse_arguments()  # Get command line arguments
 current_side = args.side if args else "white"  # Track current side
 settings_window = None
 
+# Last evaluation written to stdout and when; limits EVAL traffic to the frontend
+EVAL_MIN_INTERVAL = 0.1
+last_sent_eval = None
+last_sent_eval_time = 0.0
+
+# Background analysis: single-slot mailbox holding only the latest position
+analysis_queue = queue.Queue(maxsize=1)
+driver_lock = threading.Lock()  # Serializes WebDriver access between threads
+
+new_position_event = threading.Event()  # Set to abort an in-flight analysis
+settings_changed_event = threading.Event()  # Set by the settings watcher, consumed by the main loop
+last_drawn_position = None  # EPD of the position whose best-move arrow is currently on the board
+
+# Adaptive poll interval: reset to args.poll_interval on change, back off while idle
+POLL_MAX = 2.0
+POLL_BACKOFF = 1.5
+
+# Exponential backoff after consecutive errors, and when it should escalate to a refresh
+ERROR_BACKOFF_BASE = 0.2
+ERROR_BACKOFF_MAX = 5.0
+ERROR_BACKOFF_JITTER = 0.1
+ERROR_REFRESH_THRESHOLD = 4.0  # consecutive errors * backoff, in seconds
+
+def error_backoff(errors):
+    """Seconds to wait after the given number of consecutive errors"""
+    return min(ERROR_BACKOFF_MAX, ERROR_BACKOFF_BASE * 2 ** errors)
+
+# Streaming analysis stops once the score moves less than this between depths
+ANALYSIS_MIN_DEPTH = 12
+ANALYSIS_STABLE_CP = 10
+
+# Engine hash size (MB) and game tracking; the engine is only sent ucinewgame
+# when game_id changes, which happens when the piece count goes back up
+ENGINE_HASH_MB = 256
+game_id = 0
+last_piece_count = 0
+
+# Delay after the last settings file event before reloading it
+SETTINGS_DEBOUNCE = 0.05
+last_settings_hash = None  # Digest of the last settings file contents applied
+
+# Cheap probe used to detect new moves when the board itself looks unchanged
+MOVE_COUNT_SCRIPT = "return document.querySelectorAll('.node-highlight-content').length;"
+MOVES_SCRIPT = "return Array.from(document.querySelectorAll('.node-highlight-content'), e => e.textContent.trim());"
+
+# Transposition cache of engine analysis: position key -> ((move_uci, eval), ...)
+# Module level so it survives page refreshes; capped at args.tt_size entries (LRU)
+TT = OrderedDict()
+
+
+# Errors in a row after which full tracebacks are printed even without debug
+TRACEBACK_CRASH_THRESHOLD = 3
+
+def print_error_details(error):
+    """Print error details; the full traceback only in debug mode or once errors keep repeating"""
+    if args.debug or crash_count > TRACEBACK_CRASH_THRESHOLD:
+        console.print_exception(show_locals=False)
+    else:
+        console.print(f"[red]Error type: {type(error).__name__}: {str(error)[:120]}[/red]")
+
+# Within a legit-mode band, each extra pawn lost makes a move e^LEGIT_WEIGHT_SCALE times less likely
+LEGIT_WEIGHT_SCALE = 2.0
+
+def pick_weighted_move(moves_with_eval, min_loss, max_loss):
+    """Pick a non-best move losing min_loss..max_loss pawns, weighted toward the smaller losses"""
+    # Scores are already from our side's point of view, so a loss is simply best minus this
+    best_eval = moves_with_eval[0][1]
+    candidates = []
+    weights = []
+    for move, eval_score in moves_with_eval[1:]:  # Skip the best move
+        eval_diff = best_eval - eval_score
+        if min_loss <= eval_diff <= max_loss:
+            candidates.append(move)
+            weights.append(math.exp(-LEGIT_WEIGHT_SCALE * eval_diff))
+    if not candidates:
+        return None
+    return random.choices(candidates, weights=weights)[0]
 
 # Function to select a move based on legit mode criteria
 def select_legit_move(moves_with_eval, is_white):
     """Select a move that mimics human play, including occasional blunders"""
-    global legit_mode, current_side
+    global legit_mode
     
     if not moves_with_eval or len(moves_with_eval) < 2:
         return moves_with_eval[0][0] if moves_with_eval else None
@@ -105,44 +270,19 @@ def select_legit_move(moves_with_eval, is_white):
     # Roll for move selection type
     roll = random.random()
     
-    # Perspective adjustment: negate scores if playing as black
-    # Update this to use current_side instead of is_white
-    should_negate = (current_side == "black")
-    if should_negate:
-        moves_with_eval = [(move, -score) for move, score in moves_with_eval]
-    
-    # Get the best move's evaluation as reference
-    best_eval = moves_with_eval[0][1]
-    
-    # Case 1: Make a blunder (a significantly worse move)
+    # Case 1: Make a blunder (worse by 0.5-1.5 pawns, noticeably worse but not catastrophic)
     if roll < legit_mode.blunder_chance:
-        # Filter for moves that are noticeably worse but not catastrophic
-        blunder_candidates = []
-        for move, eval_score in moves_with_eval[1:]:  # Skip the best move
-            eval_diff = best_eval - eval_score
-            # Look for moves that are worse by 0.5-1.5 pawns
-            if 0.5 <= eval_diff <= 1.5:
-                blunder_candidates.append((move, eval_score))
-        
-        if blunder_candidates:
+        move = pick_weighted_move(moves_with_eval, 0.5, 1.5)
+        if move is not None:
             console.print("[blue]Legit mode: Suggesting a small blunder[/blue]")
-            # Select a random blunder from candidates
-            return random.choice(blunder_candidates)[0]
+            return move
     
-    # Case 2: Make a suboptimal move (slightly worse)
+    # Case 2: Make a suboptimal move (worse by 0.1-0.4 pawns)
     elif roll < legit_mode.blunder_chance + legit_mode.suboptimal_chance:
-        # Filter for moves that are slightly suboptimal
-        suboptimal_candidates = []
-        for move, eval_score in moves_with_eval[1:]:  # Skip the best move
-            eval_diff = best_eval - eval_score
-            # Look for moves that are worse by 0.1-0.4 pawns
-            if 0.1 <= eval_diff <= 0.4:
-                suboptimal_candidates.append((move, eval_score))
-        
-        if suboptimal_candidates:
+        move = pick_weighted_move(moves_with_eval, 0.1, 0.4)
+        if move is not None:
             console.print("[blue]Legit mode: Suggesting a slightly suboptimal move[/blue]")
-            # Select a random suboptimal move from candidates
-            return random.choice(suboptimal_candidates)[0]
+            return move
     
     # Case 3: Use best move (with a slight preference for different "style" best moves)
     # This is the default case
@@ -152,64 +292,66 @@ def select_legit_move(moves_with_eval, is_white):
 # Function to get alternative moves of different qualities
 def get_alternative_moves(board, engine, time_limit=0.1, multipv=5):
     """Get multiple alternative moves with their evaluations"""
-    global current_side
     if not engine or not board:
         return []
     
     try:
-        # Set time limit and multipv for analysis
+        # Set time limit for analysis
         limit = chess.engine.Limit(time=time_limit)
         
-        try:
-            # Try to configure engine for multi-PV mode
-            engine.configure({"MultiPV": multipv})
-            use_multipv = True
-        except Exception as config_error:
-            console.print(f"[yellow]Could not set MultiPV option: {config_error}. Using single PV mode.[/yellow]")
-            use_multipv = False
-        
-        # Get analysis - either multi-PV or just best move
-        if use_multipv:
-            result = engine.analyse(board, limit, multipv=multipv)
-        else:
-            # Fallback to single PV analysis
-            info = engine.analyse(board, limit)
-            result = [info]  # Wrap in list to match multi-PV format
+        # Stream a multi-PV analysis and stop early once the principal line's score has
+        # settled across consecutive depths. MultiPV is passed per search: python-chess
+        # manages that option itself and rejects engine.configure() for it, and sending it
+        # with the search costs no extra round trip
+        aborted = False
+        with engine.analysis(board, limit, multipv=multipv, game=game_id) as analysis:
+            last_depth = 0
+            last_cp = None
+            # Alternatives feed legit mode, so every line must be searched deep enough too
+            expected_lines = min(multipv, board.legal_moves.count())
+            line_depths = {}
+            for info in analysis:
+                if new_position_event.is_set():
+                    aborted = True
+                    break
+                
+                score = info.get("score")
+                depth = info.get("depth", 0)
+                if score is None:
+                    continue
+                line = info.get("multipv", 1)
+                line_depths[line] = max(depth, line_depths.get(line, 0))
+                if line != 1 or depth <= last_depth:
+                    continue
+                
+                cp = score.white().score(mate_score=10000)
+                if (depth >= ANALYSIS_MIN_DEPTH and last_cp is not None and abs(cp - last_cp) < ANALYSIS_STABLE_CP
+                        and len(line_depths) >= expected_lines and min(line_depths.values()) >= ANALYSIS_MIN_DEPTH):
+                    break
+                last_depth, last_cp = depth, cp
+            
+            result = analysis.multipv
         
-        # Reset engine to default if we were able to set it initially
-        if use_multipv:
-            try:
-                engine.configure({"MultiPV": 1})
-            except:
-                pass
+        if aborted:
+            if args.debug:
+                console.print("[dim]Analysis aborted: a newer position is waiting[/dim]")
+            return []
         
+        # Analysis only runs on our turn, so the side to move is our side and the
+        # engine's relative scores are already from our perspective; mates map to +/-9.9
         moves_with_eval = []
-        
         for entry in result:
-            moves = entry.get("pv", [])
+            moves = entry.get("pv")
             if not moves:
                 continue
-                
-            move = moves[0]
-            score = entry.get("score")
             
-            # Convert score to decimal value for current side's perspective
-            eval_score = 0.0
-            try:
-                if hasattr(score.white(), 'mate') and score.white().mate() is not None:
-                    mate_value = score.white().mate()
-                    eval_score = 9.9 if mate_value > 0 else -9.9
-                else:
-                    eval_score = score.white().score() / 100
-                
-                # Adjust score based on current side
-                if current_side == "black":
-                    eval_score = -eval_score
-                    
-            except Exception as e:
-                console.print(f"[yellow]Error processing score: {e}[/yellow]")
-            
-            moves_with_eval.append((move, eval_score))
+            relative = entry["score"].relative
+            mate = relative.mate()
+            if mate is not None:
+                eval_score = 9.9 if mate > 0 else -9.9
+            else:
+                eval_score = relative.score() / 100
+            moves_with_eval.append((moves[0], eval_score))
         
         return moves_with_eval
         
@@ -219,55 +361,50 @@ def get_alternative_moves(board, engine, time_limit=0.1, multipv=5):
 
 # Function to send evaluation to C# application
 def send_evaluation(score):
-    print(f"EVAL:{score:+.2f}")
+    global last_sent_eval, last_sent_eval_time
+    now = time.monotonic()
+    
+    # Skip repeats, and small changes arriving faster than the rate limit
+    delta = abs(score - last_sent_eval) if last_sent_eval is not None else None
+    if delta is not None and (delta < 0.01 or (now - last_sent_eval_time < EVAL_MIN_INTERVAL and delta < 0.05)):
+        return
+    
+    last_sent_eval = score
+    last_sent_eval_time = now
+    sys.stdout.write(f"EVAL:{score:+.2f}\n")
     sys.stdout.flush()  # Ensure immediate output
 
 # Initialize chess engine with better error handling
 def initialize_stockfish(path="stockfish", elo=None):
     """Initialize the Stockfish chess engine with error handling"""
     try:
-        # Try to locate Stockfish in common paths if not provided
-        if path == "stockfish":
-            possible_paths = [
-                "C:\\stockfish\\stockfish-windows-x86-64-avx2.exe",
-                "C:\\Program Files\\stockfish\\stockfish.exe",
-                "C:\\Users\\abajra8064\\Downloads\\stockfish\\stockfish-windows-x86-64-avx2.exe",
-                "C:\\stockfish\\stockfish.exe",
-                "/usr/local/bin/stockfish",
-                "/usr/bin/stockfish",
-                "stockfish"
-            ]
-            
-            for possible_path in possible_paths:
-                if os.path.exists(possible_path):
-                    path = possible_path
-                    break
-        
-        # Check if engine exists at path
-        if not os.path.exists(path):
-            console.print(f"[bold red]Stockfish not found at {path}[/bold red]")
-            console.print("[yellow]Trying to find Stockfish in PATH...[/yellow]")
-            
-            # Try finding stockfish in PATH
-            try:
-                if os.name == 'nt':  # Windows
-                    result = subprocess.run(['where', 'stockfish'], capture_output=True, text=True, check=False)
-                else:  # Unix-like
-                    result = subprocess.run(['which', 'stockfish'], capture_output=True, text=True, check=False)
-                    
-                if result.returncode == 0 and result.stdout.strip():
-                    path = result.stdout.strip()
-                    console.print(f"[green]Found Stockfish at: {path}[/green]")
-                else:
-                    raise FileNotFoundError("Stockfish not found in PATH")
-            except (subprocess.SubprocessError, FileNotFoundError) as e:
-                console.print(f"[bold red]Error locating Stockfish: {e}[/bold red]")
-                console.print("[yellow]Will run without engine analysis.[/yellow]")
-                return None
+        # Look on PATH first, then in the usual install locations
+        possible_paths = [
+            "C:\\stockfish\\stockfish-windows-x86-64-avx2.exe",
+            "C:\\Program Files\\stockfish\\stockfish.exe",
+            "C:\\Users\\abajra8064\\Downloads\\stockfish\\stockfish-windows-x86-64-avx2.exe",
+            "C:\\stockfish\\stockfish.exe",
+            "/usr/local/bin/stockfish",
+            "/usr/bin/stockfish",
+            "stockfish"
+        ] if path == "stockfish" else [path]
+        resolved = shutil.which(path) or next((p for p in possible_paths if os.path.exists(p)), None)
+        if not resolved:
+            console.print(f"[bold red]Stockfish not found at {path} or in PATH[/bold red]")
+            console.print("[yellow]Will run without engine analysis.[/yellow]")
+            return None
+        path = resolved
         
         # Initialize the engine
         engine = chess.engine.SimpleEngine.popen_uci(path)
         
+        # Give Stockfish a large hash and spare cores so its own transposition
+        # table carries search results across repeated analyses of a game
+        try:
+            engine.configure({"Hash": ENGINE_HASH_MB, "Threads": max(1, (os.cpu_count() or 2) - 1)})
+        except Exception as e:
+            console.print(f"[yellow]Could not set engine hash/threads: {e}[/yellow]")
+        
         # Set ELO rating if provided
         if elo is not None:
             try:
@@ -298,69 +435,135 @@ def initialize_stockfish(path="stockfish", elo=None):
 # Initialize stockfish with ELO from arguments
 engine = initialize_stockfish(elo=args.elo) if args.enabled else None
 
+# Lookup tables for the 64 valid squares, built once at import time
+ALG_TO_NUM = {f"{chr(ord('a') + col)}{row + 1}": f"{col + 1}{row + 1}" for col in range(8) for row in range(8)}
+NUM_TO_ALG = {num: alg for alg, num in ALG_TO_NUM.items()}
+SQUARE_TO_NUM = [ALG_TO_NUM[name] for name in chess.SQUARE_NAMES]  # python-chess square index -> numeric
+
 def convert_algebraic_to_numeric(alg):
     """Convert algebraic notation (e.g., 'g1') to numeric format (e.g., '71')"""
-    if not alg or len(alg) != 2 or not alg[0].isalpha() or not alg[1].isdigit():
-        return None
-    
-    try:
-        col_char = alg[0].lower()
-        if col_char < 'a' or col_char > 'h':
-            return None
-        col = ord(col_char) - ord('a') + 1
-        
-        row = int(alg[1])
-        if row < 1 or row > 8:
-            return None
-        
-        return f"{col}{row}"
-    except (ValueError, TypeError):
+    if not alg:
         return None
+    return ALG_TO_NUM.get(alg.lower())
 
 def convert_numeric_to_algebraic(num):
     """Convert numeric format (e.g., '71') to algebraic notation (e.g., 'g1')"""
-    if not num or len(num) != 2 or not num.isdigit():
-        return None
-    
-    try:
-        col = int(num[0])
-        row = int(num[1])
-        
-        if col < 1 or col > 8 or row < 1 or row > 8:
-            return None
-        
-        col_char = chr(ord('a') + col - 1)
-        return f"{col_char}{row}"
-    except (ValueError, TypeError):
-        return None
+    return NUM_TO_ALG.get(num)
 
-def get_board_state(driver):
-    """Get current positions of all pieces on the board with improved error handling"""
+# Selectors tried (in order) to locate the board and the pieces on it
+BOARD_SELECTORS = [
+    'wc-chess-board.board',
+    'div.board',
+    '.board-layout-chessboard',
+    '.board-container'
+]
+PIECE_SELECTORS = [
+    'div.piece',
+    '.piece',
+    '.chess-piece',
+    '[data-piece]'
+]
+
+# Scrape every piece and the move list in one round trip. Returns null if no board was found,
+# {board, piece, same: true} if the position signature equals arguments[2] (the previous one),
+# otherwise {board: <selector used>, piece: <selector used>, pieces: [[square, piece], ...], moves: [...], signature}
+SCRAPE_SCRIPT = """
+const boardSelectors = arguments[0];
+const pieceSelectors = arguments[1];
+const previousSignature = arguments[2];
+// Piece type and square token in one pattern, so each class string is scanned once
+const CLASS_RE = /\\b(?:([wb][pnbrqk])|square-(\\d\\d))\\b/g;
+let board = null, boardSelector = null, pieceSelector = null;
+for (const sel of boardSelectors) {
+    board = document.querySelector(sel);
+    if (board) { boardSelector = sel; break; }
+}
+if (!board) return null;
+const out = [];
+for (const sel of pieceSelectors) {
+    const pieces = board.querySelectorAll(sel);
+    if (!pieces.length) continue;
+    pieceSelector = sel;
+    for (const p of pieces) {
+        // Method 1: Class names (e.g. "piece wp square-52")
+        const cls = typeof p.className === 'string' ? p.className : p.getAttribute('class') || '';
+        let type = null, square = null;
+        for (const m of cls.matchAll(CLASS_RE)) {
+            if (m[1]) type = type || m[1];
+            else square = square || m[2];
+        }
+        // Method 2: Data attributes
+        if (!type || !square) {
+            if (p.dataset.piece) type = p.dataset.piece.toLowerCase();
+            if (p.dataset.square) square = p.dataset.square;
+        }
+        if (type && square) out.push([square, type]);
+    }
+    break;
+}
+const moves = Array.from(document.querySelectorAll('.node-highlight-content'), e => e.textContent.trim());
+// Unchanged position and move list: skip serializing them back to Python
+const signature = out.join(';') + '#' + moves.join(' ');
+if (signature === previousSignature) return {board: boardSelector, piece: pieceSelector, same: true};
+return {board: boardSelector, piece: pieceSelector, pieces: out, moves: moves, signature: signature};
+"""
+
+# Install (once per board element) a MutationObserver that flags board changes,
+# then read and reset that flag; true means the board must be scraped again
+BOARD_DIRTY_SCRIPT = """
+// Keep using the observed board element while it is still attached; re-resolve only once it is replaced
+let board = window.__chessObservedBoard;
+if (!board || !board.isConnected) board = document.querySelector(arguments[0]);
+if (!board) return true;
+if (window.__chessObservedBoard !== board) {
+    if (window.__chessObserver) window.__chessObserver.disconnect();
+    window.__chessObserver = new MutationObserver(() => { window.__chessDirty = true; });
+    window.__chessObserver.observe(board, {childList: true, subtree: true, attributes: true, attributeFilter: ['class']});
+    window.__chessObservedBoard = board;
+    window.__chessDirty = true;
+}
+const dirty = window.__chessDirty;
+window.__chessDirty = false;
+return dirty;
+"""
+
+# Result of the last full scrape, returned as-is while the board is not dirty or unchanged
+last_scraped_state = {}
+last_scraped_moves = None
+last_scrape_signature = None
+
+# Selectors that worked on the last successful scrape, tried before the full cascade
+cached_board_selector = None
+cached_piece_selector = None
+
+def get_board_snapshot(driver):
+    """Get positions of all pieces and the move list in one scrape; moves is None if not scraped"""
+    global last_scraped_state, last_scraped_moves, last_scrape_signature
+    global cached_board_selector, cached_piece_selector
     board_state = {}
+    moves_list = None
     try:
-        # Wait a moment for board to stabilize
-        time.sleep(0.1)
+        # Reuse the last scrape unless the board DOM has mutated since then
+        board_selector = cached_board_selector or BOARD_SELECTORS[0]
+        if last_scraped_state and not driver.execute_script(BOARD_DIRTY_SCRIPT, board_selector):
+            return last_scraped_state, None
         
-        # Find the chess board first with multiple selector attempts
-        board = None
-        selectors = [
-            'wc-chess-board.board',
-            'div.board',
-            '.board-layout-chessboard',
-            '.board-container'
-        ]
+        # Scrape with the cached (or primary) selectors first, then once more with the full cascade
+        piece_selector = cached_piece_selector or PIECE_SELECTORS[0]
+        result = driver.execute_script(SCRAPE_SCRIPT, [board_selector], [piece_selector], last_scrape_signature)
+        if not result or not (result.get('same') or result['pieces']):
+            result = driver.execute_script(SCRAPE_SCRIPT, BOARD_SELECTORS, PIECE_SELECTORS, last_scrape_signature)
         
-        for selector in selectors:
-            try:
-                board = WebDriverWait(driver, 1).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                )
-                console.print(f"[dim]Board found with selector: {selector}[/dim]")
-                break
-            except:
-                continue
+        # Board DOM mutated but the pieces and moves are the same (e.g. highlights only)
+        if result and result.get('same'):
+            return last_scraped_state, last_scraped_moves
         
-        if not board:
+        if result is None:
+            cached_board_selector = None
+            cached_piece_selector = None
+            last_scraped_state = {}
+            last_scraped_moves = None
+            last_scrape_signature = None
             console.print("[yellow]Could not find chess board with any selector[/yellow]")
             # Try to get the page source to debug
             try:
@@ -373,149 +576,89 @@ def get_board_state(driver):
                     console.print("[red]Page appears to be showing an error[/red]")
             except:
                 pass
-            return board_state
+            return board_state, moves_list
         
-        # Try multiple piece selectors
-        piece_selectors = [
-            'div.piece',
-            '.piece',
-            '.chess-piece',
-            '[data-piece]'
-        ]
-        
-        pieces = []
-        for selector in piece_selectors:
-            try:
-                pieces = board.find_elements(By.CSS_SELECTOR, selector)
-                if pieces:
-                    console.print(f"[dim]Pieces found with selector: {selector} (count: {len(pieces)})[/dim]")
-                    break
-            except:
-                continue
-        
-        if not pieces:
-            console.print("[yellow]No pieces found on board with any selector[/yellow]")
-            
-            # Try to get board HTML for debugging
-            try:
-                board_html = board.get_attribute('innerHTML')
-                if len(board_html) > 500:
-                    board_html = board_html[:500] + "... [truncated]"
-                console.print(f"[dim]Board HTML: {board_html}[/dim]")
-            except:
-                pass
-                
-            return board_state
-            
-        for piece in pieces:
-            try:
-                # Try multiple ways to get piece information
-                piece_type = None
-                position = None
-                
-                # Method 1: Class names
-                class_list = piece.get_attribute('class')
-                if class_list:
-                    class_list = class_list.split()
-                    # Extract piece type and position from class names
-                    piece_types = [c for c in class_list if c.startswith(('b', 'w')) and len(c) == 2]
-                    positions = [c for c in class_list if c.startswith('square-')]
-                    
-                    if piece_types:
-                        piece_type = piece_types[0]
-                    if positions:
-                        position = positions[0].split('-')[1] if '-' in positions[0] else positions[0]
-                
-                # Method 2: Data attributes
-                if not piece_type or not position:
-                    data_piece = piece.get_attribute('data-piece')
-                    data_square = piece.get_attribute('data-square')
-                    
-                    if data_piece:
-                        piece_type = data_piece.lower()
-                    if data_square:
-                        position = data_square
-                
-                # Method 3: Style positioning
-                if not position:
-                    style = piece.get_attribute('style')
-                    if style:
-                        # This requires custom parsing based on Chess.com's positioning
-                        console.print(f"[dim]Piece with style but no position: {style}[/dim]")
-                
-                # Store piece if we have both type and position
-                if piece_type and position:
-                    board_state[position] = piece_type
-                else:
-                    console.print(f"[yellow]Incomplete piece info - type: {piece_type}, position: {position}[/yellow]")
-                    
-                    # Log the raw piece HTML for debugging
-                    try:
-                        piece_html = piece.get_attribute('outerHTML')
-                        console.print(f"[dim]Problem piece HTML: {piece_html}[/dim]")
-                    except:
-                        pass
-                        
-            except StaleElementReferenceException:
-                # Piece was updated during iteration, skip it
-                console.print("[dim]Skipped stale piece element[/dim]")
-                continue
-            except Exception as piece_error:
-                console.print(f"[yellow]Error processing piece: {piece_error}[/yellow]")
-                continue
+        board_state = dict(result['pieces'])
+        moves_list = result['moves']
+        last_scraped_moves = moves_list
+        last_scrape_signature = result['signature']
+        if board_state:
+            if args.debug and (result['board'] != cached_board_selector or result['piece'] != cached_piece_selector):
+                console.print(f"[dim]Board found with selector: {result['board']}, pieces with: {result['piece']}[/dim]")
+            cached_board_selector = result['board']
+            cached_piece_selector = result['piece']
                 
         # Log final result
         if board_state:
-            console.print(f"[dim]Found {len(board_state)} pieces on the board[/dim]")
+            if args.debug:
+                console.print(f"[dim]Found {len(board_state)} pieces on the board[/dim]")
         else:
-            console.print("[yellow]No pieces could be processed properly[/yellow]")
+            console.print("[yellow]No pieces found on board with any selector[/yellow]")
             
     except TimeoutException:
         console.print("[yellow]Timeout waiting for chess board[/yellow]")
     except Exception as e:
         console.print(f"[red]Error getting board state: {e}[/red]")
-        # Print traceback for better debugging
-        import traceback
-        console.print(f"[dim red]{traceback.format_exc()}[/dim red]")
+        print_error_details(e)
     
-    return board_state
+    last_scraped_state = board_state
+    if not board_state:
+        # Never answer a later "same" scrape with an empty state
+        last_scrape_signature = None
+    return board_state, moves_list
+
+def get_board_state(driver):
+    """Get current positions of all pieces on the board with improved error handling"""
+    return get_board_snapshot(driver)[0]
 
 def find_moved_pieces(old_state, new_state):
     """Compare two board states to find moved pieces"""
-    # Find pieces that are in new positions
-    appeared = {pos: piece for pos, piece in new_state.items() 
-               if pos not in old_state or old_state[pos] != piece}
-    
-    # Find pieces that disappeared from their old positions
-    disappeared = {pos: piece for pos, piece in old_state.items() 
-                 if pos not in new_state or new_state[pos] != piece}
+    # The items-view differences are computed in C and hold only the 2-4 squares a ply touches
+    disappeared = defaultdict(list)
+    for pos, piece in old_state.items() - new_state.items():
+        disappeared[piece].append(pos)
     
-    # Group by piece type to find moves
+    # Pair each piece that appeared on a new square with a square it left
     moves = []
-    for old_pos, old_piece in disappeared.items():
-        for new_pos, new_piece in appeared.items():
-            if old_piece == new_piece:
-                moves.append((old_pos, new_pos, old_piece))
-                # Remove these items to avoid duplicate matching
-                appeared.pop(new_pos)
-                break
+    for new_pos, piece in new_state.items() - old_state.items():
+        if disappeared.get(piece):
+            moves.append((disappeared[piece].pop(), new_pos, piece))
+        elif piece[1:] != 'p' and new_pos[1:] in ('1', '8') and disappeared.get(piece[0] + 'p'):
+            # Promotion: a pawn left the board and a new piece appeared on the last rank
+            moves.append((disappeared[piece[0] + 'p'].pop(), new_pos, piece))
     
     return moves
 
-def get_fen_from_board(board_state):
-    """Convert current board state to FEN notation with improved handling"""
-    # Initialize empty board
-    board = [['' for _ in range(8)] for _ in range(8)]
-    
-    # Map pieces to FEN notation
-    piece_map = {
-        'wp': 'P', 'wn': 'N', 'wb': 'B', 'wr': 'R', 'wq': 'Q', 'wk': 'K',
-        'bp': 'p', 'bn': 'n', 'bb': 'b', 'br': 'r', 'bq': 'q', 'bk': 'k'
-    }
-    
+# Scraped piece codes to python-chess pieces
+STATE_PIECES = {
+    'wp': chess.Piece(chess.PAWN, chess.WHITE), 'wn': chess.Piece(chess.KNIGHT, chess.WHITE),
+    'wb': chess.Piece(chess.BISHOP, chess.WHITE), 'wr': chess.Piece(chess.ROOK, chess.WHITE),
+    'wq': chess.Piece(chess.QUEEN, chess.WHITE), 'wk': chess.Piece(chess.KING, chess.WHITE),
+    'bp': chess.Piece(chess.PAWN, chess.BLACK), 'bn': chess.Piece(chess.KNIGHT, chess.BLACK),
+    'bb': chess.Piece(chess.BISHOP, chess.BLACK), 'br': chess.Piece(chess.ROOK, chess.BLACK),
+    'bq': chess.Piece(chess.QUEEN, chess.BLACK), 'bk': chess.Piece(chess.KING, chess.BLACK)
+}
+
+# Scraped square names (numeric '52' or algebraic 'e2'/'E2') to python-chess squares
+STATE_SQUARES = {}
+for alg, num in ALG_TO_NUM.items():
+    square = chess.parse_square(alg)
+    STATE_SQUARES[num] = STATE_SQUARES[alg] = STATE_SQUARES[alg.upper()] = square
+
+def state_to_piece_map(board_state):
+    """Convert a scraped board state (numeric or algebraic squares) to a python-chess piece map"""
+    piece_map = {}
+    for position, piece in board_state.items():
+        square = STATE_SQUARES.get(position)
+        if square is not None and piece in STATE_PIECES:
+            piece_map[square] = STATE_PIECES[piece]
+    return piece_map
+
+def get_board_from_state(board_state):
+    """Build a chess.Board from the scraped board state with improved handling"""
     # Check if the board state is valid
     if not board_state:
-        console.print("[red]Empty board state, cannot create FEN[/red]")
+        console.print("[red]Empty board state, cannot build board[/red]")
         return None
     
     # Count pieces to validate the board state
@@ -531,192 +674,123 @@ def get_fen_from_board(board_state):
         console.print(f"[red]Invalid board state - kings: white={king_count['w']}, black={king_count['b']}[/red]")
         return None
     
-    # Populate board array with better error handling
-    for position, piece in board_state.items():
-        try:
-            # Handle both algebraic and numeric formats
-            if len(position) == 2:
-                if position[0].isalpha():
-                    # Algebraic notation (e.g., "e2")
-                    col = ord(position[0].lower()) - ord('a')
-                    row = 8 - int(position[1])
-                else:
-                    # Numeric notation (e.g., "52")
-                    col = int(position[0]) - 1
-                    row = 8 - int(position[1])
-                
-                if 0 <= col < 8 and 0 <= row < 8:
-                    board[row][col] = piece_map.get(piece, '')
-        except (ValueError, IndexError):
-            pass  # Skip invalid positions
-    
-    # Convert to FEN string
-    fen_parts = []
-    for row in board:
-        empty = 0
-        fen_row = ''
-        for cell in row:
-            if cell == '':
-                empty += 1
-            else:
-                if empty > 0:
-                    fen_row += str(empty)
-                    empty = 0
-                fen_row += cell
-        if empty > 0:
-            fen_row += str(empty)
-        fen_parts.append(fen_row)
+    # Place pieces directly, skipping FEN stringification and parsing
+    board = chess.Board.empty()
+    board.set_piece_map(state_to_piece_map(board_state))
     
     # Determine whose turn it is based on global variable
-    active_color = 'w' if current_turn == "white" else 'b'
+    board.turn = chess.WHITE if current_turn == "white" else chess.BLACK
     
-    # Complete FEN with simplified castling rights and other fields
-    fen = '/'.join(fen_parts) + f' {active_color} KQkq - 0 1'
-    return fen
+    # Simplified castling rights: allow whatever the king/rook placement permits
+    board.castling_rights = chess.BB_CORNERS
+    board.castling_rights = board.clean_castling_rights()
+    return board
 
-def create_arrow(driver, from_square, to_square, color=None, width=2.5):
-    """Create an arrow from one square to another with improved appearance"""
-    if color is None:
-        color = args.arrow_color  # Use color from arguments
-        
+# Replace any previous arrow with the given SVG markup in a single DOM insert
+ARROW_SCRIPT = """
+const arrowsSvg = document.querySelector('wc-chess-board.board svg.arrows');
+if (!arrowsSvg) return false;
+arrowsSvg.querySelectorAll('.custom-arrow, .square-border').forEach(a => a.remove());
+arrowsSvg.insertAdjacentHTML('beforeend', arguments[0]);
+return true;
+"""
+
+@functools.lru_cache(maxsize=256)
+def arrow_svg(from_square, to_square, color, width):
+    """Build the SVG markup (square borders, shaft, head) for an arrow between two numeric squares"""
+    # Square size as percentage of the board
+    square_size = 12.5
+    
+    # Calculate positions (use square centers)
+    from_x = (int(from_square[0]) - 0.5) * square_size
+    from_y = (8.5 - int(from_square[1])) * square_size
+    to_x = (int(to_square[0]) - 0.5) * square_size
+    to_y = (8.5 - int(to_square[1])) * square_size
+    
+    # Normalized direction vector and its perpendicular
+    dx = to_x - from_x
+    dy = to_y - from_y
+    length = math.hypot(dx, dy)
+    ndx = dx / length
+    ndy = dy / length
+    px, py = -ndy, ndx
+    
+    # Offset tail and tip from the square centers so the pieces stay visible
+    edge_offset = square_size * 0.3
+    tail_x = from_x + ndx * edge_offset
+    tail_y = from_y + ndy * edge_offset
+    tip_x = to_x - ndx * edge_offset
+    tip_y = to_y - ndy * edge_offset
+    
+    # Arrow head: base behind the tip, corners either side of the base
+    head_size = square_size * 0.35
+    base_x = tip_x - ndx * (head_size * 0.6)
+    base_y = tip_y - ndy * (head_size * 0.6)
+    corner1_x = base_x + px * (head_size * 0.5)
+    corner1_y = base_y + py * (head_size * 0.5)
+    corner2_x = base_x - px * (head_size * 0.5)
+    corner2_y = base_y - py * (head_size * 0.5)
+    
+    # Borders for the from and to squares
+    borders = ''.join(
+        f'<rect class="square-border" x="{(int(sq[0]) - 1) * square_size}%" y="{(8 - int(sq[1])) * square_size}%" '
+        f'width="12.5%" height="12.5%" fill="none" stroke="{color}" stroke-width="0.3" style="pointer-events: none"/>'
+        for sq in (from_square, to_square)
+    )
+    points = f"{base_x:.3f},{base_y:.3f} {corner1_x:.3f},{corner1_y:.3f} {tip_x:.3f},{tip_y:.3f} {corner2_x:.3f},{corner2_y:.3f}"
+    return (
+        borders +
+        f'<line class="custom-arrow" x1="{tail_x:.3f}%" y1="{tail_y:.3f}%" x2="{base_x:.3f}%" y2="{base_y:.3f}%" '
+        f'stroke="{color}" stroke-width="{width}" style="pointer-events: none"/>'
+        f'<polygon class="custom-arrow" points="{points}" fill="{color}" style="pointer-events: none"/>'
+    )
+
+def create_arrows(driver, arrows):
+    """Replace the drawn arrows with [(from_square, to_square, color, width), ...] in one round trip"""
     try:
-        script = f"""
-        (function() {{
-            // Find the chess board and its SVG arrows element
-            const board = document.querySelector('wc-chess-board.board');
-            const arrowsSvg = board?.querySelector('svg.arrows');
-            if (!board || !arrowsSvg) return false;
-            
-            // Calculate positions (use square centers)
-            const fromX = (parseInt('{from_square}'[0]) - 0.5) * 12.5;
-            const fromY = (8.5 - parseInt('{from_square}'[1])) * 12.5;
-            const toX = (parseInt('{to_square}'[0]) - 0.5) * 12.5;
-            const toY = (8.5 - parseInt('{to_square}'[1])) * 12.5;
-            
-            // Calculate the direction vector
-            const dx = toX - fromX;
-            const dy = toY - fromY;
-            const length = Math.sqrt(dx*dx + dy*dy);
-            
-            // Normalize direction vector
-            const ndx = dx / length;
-            const ndy = dy / length;
-            
-            // Calculate perpendicular vector
-            const px = -ndy;
-            const py = ndx;
-            
-            // Square size as percentage (12.5%)
-            const squareSize = 12.5;
-            
-            // Calculate offsets to avoid covering the pieces (percentage of square)
-            const edgeOffset = squareSize * 0.3;
-            
-            // Calculate points with offset from square edges
-            const tailX = fromX + ndx * edgeOffset;
-            const tailY = fromY + ndy * edgeOffset;
-            
-            // Calculate the tip position with offset from target edge
-            const tipX = toX - ndx * edgeOffset;
-            const tipY = toY - ndy * edgeOffset;
-            
-            // Arrow head size based on square size
-            const headSize = squareSize * 0.35;
-            
-            // Create arrow head points
-            // First calculate the base of the arrow head
-            const baseX = tipX - ndx * (headSize * 0.6);
-            const baseY = tipY - ndy * (headSize * 0.6);
-            
-            // Then calculate the corners of the arrow head
-            const headCorner1X = baseX + px * (headSize * 0.5);
-            const headCorner1Y = baseY + py * (headSize * 0.5);
-            const headCorner2X = baseX - px * (headSize * 0.5);
-            const headCorner2Y = baseY - py * (headSize * 0.5);
-            
-            // Remove any existing custom arrows and borders
-            const existingArrows = arrowsSvg.querySelectorAll('.custom-arrow, .square-border');
-            existingArrows.forEach(a => a.remove());
-            
-            // Create borders for from and to squares
-            const fromSquareRect = document.createElementNS('http://www.w3.org/2000/svg', 'rect');
-            fromSquareRect.setAttribute('x', (parseInt('{from_square}'[0]) - 1) * 12.5 + '%');
-            fromSquareRect.setAttribute('y', (8 - parseInt('{from_square}'[1])) * 12.5 + '%');
-            fromSquareRect.setAttribute('width', '12.5%');
-            fromSquareRect.setAttribute('height', '12.5%');
-            fromSquareRect.setAttribute('fill', 'none');
-            fromSquareRect.setAttribute('stroke', '{color}');
-            fromSquareRect.setAttribute('stroke-width', '0.3');  // Made border much thinner
-            fromSquareRect.setAttribute('class', 'square-border');
-            fromSquareRect.style.pointerEvents = 'none';
-            
-            const toSquareRect = document.createElementNS('http://www.w3.org/2000/svg', 'rect');
-            toSquareRect.setAttribute('x', (parseInt('{to_square}'[0]) - 1) * 12.5 + '%');
-            toSquareRect.setAttribute('y', (8 - parseInt('{to_square}'[1])) * 12.5 + '%');
-            toSquareRect.setAttribute('width', '12.5%');
-            toSquareRect.setAttribute('height', '12.5%');
-            toSquareRect.setAttribute('fill', 'none');
-            toSquareRect.setAttribute('stroke', '{color}');
-            toSquareRect.setAttribute('stroke-width', '0.3');  // Made border much thinner
-            toSquareRect.setAttribute('class', 'square-border');
-            toSquareRect.style.pointerEvents = 'none';
-            
-            // Create the arrow shaft
-            const arrowShaft = document.createElementNS('http://www.w3.org/2000/svg', 'line');
-            arrowShaft.setAttribute('x1', tailX + '%');
-            arrowShaft.setAttribute('y1', tailY + '%');
-            arrowShaft.setAttribute('x2', baseX + '%');
-            arrowShaft.setAttribute('y2', baseY + '%');
-            arrowShaft.setAttribute('stroke', '{color}');
-            arrowShaft.setAttribute('stroke-width', '{width}');
-            arrowShaft.setAttribute('class', 'custom-arrow');
-            arrowShaft.style.pointerEvents = 'none';
-            
-            // Create the arrow head
-            const arrowHead = document.createElementNS('http://www.w3.org/2000/svg', 'polygon');
-            const points = `${{baseX}},${{baseY}} ${{headCorner1X}},${{headCorner1Y}} ${{tipX}},${{tipY}} ${{headCorner2X}},${{headCorner2Y}}`;
-            arrowHead.setAttribute('points', points);
-            arrowHead.setAttribute('fill', '{color}');
-            arrowHead.setAttribute('class', 'custom-arrow');
-            arrowHead.style.pointerEvents = 'none';
-            
-            // Add all elements to the SVG
-            arrowsSvg.appendChild(fromSquareRect);
-            arrowsSvg.appendChild(toSquareRect);
-            arrowsSvg.appendChild(arrowShaft);
-            arrowsSvg.appendChild(arrowHead);
-            
-            return true;
-        }})();
-        """
-        driver.execute_script(script)
-        return True
+        markup = ''.join(arrow_svg(from_square, to_square, color or args.arrow_rgba_str, width)
+                         for from_square, to_square, color, width in arrows)
+        return driver.execute_script(ARROW_SCRIPT, markup)
     except Exception as e:
         console.print(f"[yellow]Error creating arrow: {e}[/yellow]")
 
-def get_current_position_from_fen(fen):
-    """Create a chess board from FEN string"""
-    if not fen:
-        return None
-    try:
-        return chess.Board(fen)
-    except ValueError as e:
-        console.print(f"[yellow]Invalid FEN: {e}[/yellow]")
-        return None
+def create_arrow(driver, from_square, to_square, color=None, width=2.5):
+    """Create an arrow from one square to another with improved appearance"""
+    return create_arrows(driver, [(from_square, to_square, color, width)])
 
-def get_best_move(board, engine, time_limit=0.1):
+def get_best_move(board, engine, time_limit=0.2):
     """Get the best move from the engine with legit mode support"""
-    global evaluation_score, legit_mode
+    global evaluation_score, legit_mode, game_id, last_piece_count
     
     if not engine or not board:
         return None, 0.0
     
     try:
-        # Get multiple candidate moves
-        moves_with_eval = get_alternative_moves(board, engine, time_limit, multipv=5)
+        # Pieces never come back within a game, so more pieces means a new game
+        piece_count = len(board.piece_map())
+        if piece_count > last_piece_count:
+            game_id += 1
+        last_piece_count = piece_count
+        
+        # Look up the position in the transposition cache before asking the engine;
+        # the EPD covers placement, side to move, castling and en passant
+        key = board.epd()
+        cached = TT.get(key)
+        if cached is not None:
+            TT.move_to_end(key)
+            moves_with_eval = [(chess.Move.from_uci(uci), score) for uci, score in cached]
+        else:
+            # Get multiple candidate moves
+            moves_with_eval = get_alternative_moves(board, engine, time_limit, multipv=5)
+            if moves_with_eval:
+                TT[key] = tuple((move.uci(), score) for move, score in moves_with_eval)
+                while len(TT) > args.tt_size:  # tt_size may have shrunk since the last insert
+                    TT.popitem(last=False)  # Evict least recently used position
         
         if not moves_with_eval:
-            console.print("[yellow]No moves found in analysis[/yellow]")
+            # An aborted search was superseded by a newer position; that is not a failure
+            if not new_position_event.is_set():
+                console.print("[yellow]No moves found in analysis[/yellow]")
             return None, 0.0
         
         # Default evaluation from best move
@@ -739,12 +813,8 @@ def get_best_move(board, engine, time_limit=0.1):
 def get_moves_list(driver):
     """Get the list of moves played in the game"""
     try:
-        # Find all move elements
-        moves = []
-        move_elements = driver.find_elements(By.CSS_SELECTOR, '.node-highlight-content')
-        for move in move_elements:
-            moves.append(move.text)
-        return moves
+        # One round trip for the whole list instead of one .text call per move element
+        return driver.execute_script(MOVES_SCRIPT)
     except Exception as e:
         console.print(f"[yellow]Error getting moves list: {e}[/yellow]")
         return []
@@ -758,13 +828,41 @@ def detect_turn_from_moves(moves):
     # If odd number of moves, it's black's turn
     return "black" if len(moves) % 2 == 1 else "white"
 
+def update_live_board(moved):
+    """Push detected piece moves onto the persistent board"""
+    if live_board is None:
+        return
+    
+    # Apply king moves first so castling is pushed as a single king move
+    for old_pos, new_pos, piece in sorted(moved, key=lambda m: m[2][1:] != 'k'):
+        from_square = STATE_SQUARES.get(old_pos)
+        to_square = STATE_SQUARES.get(new_pos)
+        if from_square is None or to_square is None:
+            continue
+        
+        move = chess.Move(from_square, to_square)
+        if not live_board.is_legal(move) and piece[1:] != 'p':
+            # A pawn that arrived as another piece was promoted
+            move = chess.Move(from_square, to_square, promotion=STATE_PIECES[piece].piece_type)
+        if live_board.is_legal(move):
+            live_board.push(move)
+
+def live_board_matches(board_state):
+    """Check whether the persistent board agrees with the scraped state and turn"""
+    if live_board is None:
+        return False
+    if live_board.turn != (current_turn == "white"):
+        return False
+    return live_board.piece_map() == state_to_piece_map(board_state)
+
 def analyze_and_display_best_move(driver, board_state):
     """Analyze the position and display the best move"""
-    global evaluation_score, current_turn, args
+    global evaluation_score, current_turn, args, live_board
     
     # Make sure we check if analysis is enabled immediately
     if not args.enabled:
-        console.print("[dim]Analysis disabled by user settings[/dim]")
+        if args.debug:
+            console.print("[dim]Analysis disabled by user settings[/dim]")
         # Clean up any existing arrows since analysis is disabled
         clean_up_visual_elements(driver)
         return
@@ -773,96 +871,142 @@ def analyze_and_display_best_move(driver, board_state):
     if not engine:
         return
     
-    # Get FEN representation of the board
-    fen = get_fen_from_board(board_state)
-    if not fen:
-        console.print("[yellow]Could not generate valid FEN, skipping analysis[/yellow]")
-        return
-    
-    # Skip if analysis is disabled
-    if not args.enabled or not engine:
-        # Only print message about disabled analysis if we have an engine
-        if engine and not args.enabled:
-            console.print("[dim]Analysis disabled by user settings[/dim]")
+    # Use the incrementally maintained board when it agrees with the scrape
+    if live_board_matches(board_state):
+        board = live_board
+    else:
+        # Build a board from the scraped state
+        board = get_board_from_state(board_state)
+        if not board:
+            console.print("[yellow]Could not build a valid board, skipping analysis[/yellow]")
             return
+        
+        # Resync the persistent board from the scraped position
+        live_board = board
     
-    # Get FEN representation of the board
-    fen = get_fen_from_board(board_state)
-    if not fen:
-        console.print("[yellow]Could not generate valid FEN, skipping analysis[/yellow]")
-        return
-    
-    # Create chess board object from FEN
-    board = get_current_position_from_fen(fen)
-    if not board:
-        console.print("[yellow]Could not create valid board from FEN, skipping analysis[/yellow]")
-        return
-    
-    # Get best move from engine
-    best_move, score = get_best_move(board, engine)
-    if not best_move:
-        console.print("[yellow]No best move found after attempts[/yellow]")
+    # The arrow for this exact position is already drawn
+    if board.epd() == last_drawn_position:
         return
     
-    # Convert chess.Move to algebraic notation
-    from_square = chess.square_name(best_move.from_square)
-    to_square = chess.square_name(best_move.to_square)
+    # Hand the position to the analysis worker, replacing any request not yet picked up
+    new_position_event.set()
+    try:
+        analysis_queue.get_nowait()
+    except queue.Empty:
+        pass
+    analysis_queue.put_nowait((board.copy(), time.monotonic()))
+
+def analysis_worker(driver):
+    """Analyze queued positions off the monitor thread and draw the best move"""
+    global last_drawn_position
+    while True:
+        board, requested_at = analysis_queue.get()
+        new_position_event.clear()
+        try:
+            # Get best move from engine
+            best_move, score = get_best_move(board, engine)
+            if not best_move:
+                if not new_position_event.is_set():
+                    console.print("[yellow]No best move found after attempts[/yellow]")
+                continue
+            
+            # Drop the result if the position changed while we were thinking
+            if last_move_detected_at > requested_at or not analysis_queue.empty():
+                continue
+            
+            with driver_lock:
+                # Analysis may have been disabled (and the arrows cleared) during the search
+                if not args.enabled:
+                    continue
+                display_best_move(driver, best_move, score)
+                last_drawn_position = board.epd()
+        except Exception as e:
+            console.print(f"[yellow]Error in analysis worker: {e}[/yellow]")
+
+def display_best_move(driver, best_move, score):
+    """Draw the arrow for a best move and log it"""
+    # Numeric format for visualization, straight from the square indices
+    source_pos = SQUARE_TO_NUM[best_move.from_square]
+    target_pos = SQUARE_TO_NUM[best_move.to_square]
     
-    # Convert to numeric format for visualization
-    source_pos = convert_algebraic_to_numeric(from_square)
-    target_pos = convert_algebraic_to_numeric(to_square)
+    # Create arrow to show best move
+    create_arrow(driver, source_pos, target_pos, width=3)
     
-    if source_pos and target_pos:
-        # Create arrow to show best move
-        create_arrow(driver, source_pos, target_pos, width=3)
-        
-        # Log the best move with evaluation
-        console.print(f"[bold]Best Move:[/bold] {from_square}{to_square} [bold]Eval:[/bold] {score:+.2f}")
+    # Log the best move with evaluation
+    console.print(f"[bold]Best Move:[/bold] {best_move.uci()[:4]} [bold]Eval:[/bold] {score:+.2f}")
 
 def monitor_board_state(driver):
-    """Monitor the chess board for changes and analyze positions"""
+    """Monitor the chess board for changes and analyze positions; returns True if the board changed"""
     global previous_board_state, current_turn, last_moves, evaluation_score, args, crash_count
+    global last_board_fingerprint, last_move_count, last_move_detected_at, last_drawn_position
+    global fingerprinted_state, last_fingerprint_value
+    
+    # Read the settings once per tick; the watcher thread may update args mid-cycle
+    debug, side = args.debug, args.side
     
     try:
         # Log the current monitoring cycle and crash counter
-        console.print(f"[dim]Monitoring cycle - crash count: {crash_count}[/dim]")
+        if debug:
+            console.print(f"[dim]Monitoring cycle - crash count: {crash_count}[/dim]")
         
         # Get current state of the board
-        console.print("[dim]Attempting to get board state...[/dim]")
-        current_board_state = get_board_state(driver)
+        if debug:
+            console.print("[dim]Attempting to get board state...[/dim]")
+        current_board_state, moves_list = get_board_snapshot(driver)
+        
+        # Skip the rest of the tick if nothing changed since the last one
+        # get_board_snapshot hands back the very same dict while the board is unchanged,
+        # so an identity check replaces re-hashing every piece on quiet polls
+        if current_board_state is not fingerprinted_state:
+            fingerprinted_state = current_board_state
+            last_fingerprint_value = hash(frozenset(current_board_state.items()))
+        state_fingerprint = last_fingerprint_value
+        if current_board_state and state_fingerprint == last_board_fingerprint:
+            move_count = len(moves_list) if moves_list is not None else driver.execute_script(MOVE_COUNT_SCRIPT)
+            if move_count == last_move_count:
+                crash_count = 0
+                return False
         
         # Log board state count
         piece_count = len(current_board_state) if current_board_state else 0
-        console.print(f"[dim]Board state pieces found: {piece_count}[/dim]")
+        if debug:
+            console.print(f"[dim]Board state pieces found: {piece_count}[/dim]")
         
         # Get current moves list
+        turn_changed = False
         try:
-            console.print("[dim]Attempting to get moves list...[/dim]")
-            moves_list = get_moves_list(driver)
+            if debug:
+                console.print("[dim]Attempting to get moves list...[/dim]")
+            if moves_list is None:
+                moves_list = get_moves_list(driver)
+            last_move_count = len(moves_list)
             if moves_list:
-                console.print(f"Current moves: {', '.join(moves_list[-5:]) if len(moves_list) > 5 else moves_list}", style="cyan")
+                if debug:
+                    console.print(f"Current moves: {', '.join(moves_list[-5:]) if len(moves_list) > 5 else moves_list}", style="cyan")
                 
                 # Update whose turn it is
                 previous_turn = current_turn
                 current_turn = detect_turn_from_moves(moves_list)
-                if previous_turn != current_turn:
+                turn_changed = previous_turn != current_turn
+                if turn_changed:
                     console.print(f"[blue]Turn changed: {previous_turn} -> {current_turn}[/blue]")
         except Exception as move_error:
             console.print(f"[yellow]Error getting moves list: {move_error}[/yellow]")
-            console.print(f"[red]Move error details: {type(move_error).__name__}[/red]")
-            console.print(f"[red]Traceback: {traceback.format_exc()}[/red]")
+            print_error_details(move_error)
         
         # Skip analysis if board state is empty
         if not current_board_state:
-            console.print("[yellow]Empty board state detected, waiting...[/yellow]")
-            return
+            # Only announce the transition to an empty board, not every poll while it stays empty
+            if state_fingerprint != last_board_fingerprint:
+                console.print("[yellow]Empty board state detected, waiting...[/yellow]")
+                last_board_fingerprint = state_fingerprint
+            return False
         
         # Log the board state difference
-        if previous_board_state:
-            added = {pos: piece for pos, piece in current_board_state.items() 
-                   if pos not in previous_board_state}
-            removed = {pos: piece for pos, piece in previous_board_state.items() 
-                     if pos not in current_board_state}
+        if debug and previous_board_state:
+            # Squares newly occupied / vacated, as C-level key-view differences
+            added = current_board_state.keys() - previous_board_state.keys()
+            removed = previous_board_state.keys() - current_board_state.keys()
             
             if added or removed:
                 console.print(f"[dim]Board changes - Added: {len(added)}, Removed: {len(removed)}[/dim]")
@@ -870,12 +1014,16 @@ def monitor_board_state(driver):
         # Check for moved pieces if we have a previous state
         if previous_board_state:
             try:
-                console.print("[dim]Checking for moved pieces...[/dim]")
+                if debug:
+                    console.print("[dim]Checking for moved pieces...[/dim]")
                 moved = find_moved_pieces(previous_board_state, current_board_state)
                 
                 # If pieces moved, update last moves and analyze
                 if moved:
-                    console.print(f"[green]Detected {len(moved)} moved piece(s)[/green]")
+                    if debug:
+                        console.print(f"[green]Detected {len(moved)} moved piece(s)[/green]")
+                    last_move_detected_at = time.monotonic()
+                    update_live_board(moved)
                     for old_pos, new_pos, piece in moved:
                         color = "white" if piece.startswith('w') else "black"
                         last_moves[color] = new_pos
@@ -891,140 +1039,304 @@ def monitor_board_state(driver):
                     
                     # Only analyze if it's our turn (after opponent moved)
                     # This depends on which side the user is playing
-                    our_turn = ((args.side == "white" and current_turn == "white") or 
-                               (args.side == "black" and current_turn == "black"))
+                    our_turn = ((side == "white" and current_turn == "white") or 
+                               (side == "black" and current_turn == "black"))
                     
-                    console.print(f"[dim]Our side: {args.side}, Current turn: {current_turn}, Should analyze: {our_turn}[/dim]")
+                    if debug:
+                        console.print(f"[dim]Our side: {side}, Current turn: {current_turn}, Should analyze: {our_turn}[/dim]")
                     
                     if our_turn:
-                        console.print("[blue]It's our turn - analyzing position for best move[/blue]")
+                        if debug:
+                            console.print("[blue]It's our turn - analyzing position for best move[/blue]")
                         analyze_and_display_best_move(driver, current_board_state)
-                    else:
+                    elif debug:
                         console.print("[dim]Waiting for opponent to move...[/dim]")
+                
+                # The scrape can catch the board before the move list is updated; the tick that
+                # saw the move then still had the opponent to move, so analyze once the list
+                # catches up and the turn flips to us
+                elif (turn_changed and current_turn == side and live_board is not None
+                        and live_board.epd() != last_drawn_position):
+                    if debug:
+                        console.print("[blue]Move list caught up - analyzing position for best move[/blue]")
+                    analyze_and_display_best_move(driver, current_board_state)
             except Exception as move_error:
                 console.print(f"[yellow]Error processing moves: {move_error}[/yellow]")
-                console.print(f"[red]Move processing error details: {type(move_error).__name__}[/red]")
-                console.print(f"[red]Traceback: {traceback.format_exc()}[/red]")
+                print_error_details(move_error)
         
         # Update previous state for next comparison
-        previous_board_state = current_board_state
+        # Copy into our own dict: current_board_state may be the scrape cache itself
+        previous_board_state.clear()
+        previous_board_state.update(current_board_state)
+        last_board_fingerprint = state_fingerprint
         
         # Reset crash counter on successful execution
         crash_count = 0
+        return True
         
     except StaleElementReferenceException:
+        # Only counts toward the error backoff; the next cycle simply scrapes again
         crash_count += 1
-        console.print(f"[yellow]Stale element reference error (crash #{crash_count}) - board likely changed during processing[/yellow]")
+        if debug:
+            console.print(f"[yellow]Stale element reference (crash #{crash_count}) - retrying next cycle[/yellow]")
         # Don't update previous_board_state here to retry on next iteration
     except NoSuchElementException:
         crash_count += 1
         console.print(f"[yellow]Element not found error (crash #{crash_count}) - board structure may have changed[/yellow]")
         # Reset previous state to force fresh analysis
-        previous_board_state = {}
+        previous_board_state.clear()
+        last_drawn_position = None
     except Exception as e:
         crash_count += 1
         console.print(f"[bold red]Error in monitor_board_state (crash #{crash_count}): {e}[/bold red]")
-        console.print(f"[red]Error type: {type(e).__name__}[/red]")
-        console.print(f"[red]Traceback: {traceback.format_exc()}[/red]")
+        print_error_details(e)
         # Don't crash the main loop
+    
+    # Errors count as a change so polling resumes at full speed once the error backoff clears
+    return True
 
 
+# Defines window.__cleanupArrows once per page and binds it to the 'c' key
+CLEANUP_INSTALL_SCRIPT = """
+if (!window.__cleanupArrows) {
+    window.__cleanupArrows = function() {
+        // Remove custom arrows, their square borders and highlights in a single DOM pass
+        document.querySelectorAll('svg.arrows .custom-arrow, svg.arrows .square-border, .custom-highlight').forEach(node => node.remove());
+        
+        return true;
+    };
+    
+    // Press 'c' to clean up visual elements
+    document.addEventListener('keydown', function(e) {
+        if (e.key === 'c') window.__cleanupArrows();
+    });
+}
+"""
+CLEANUP_CALL_SCRIPT = "return window.__cleanupArrows ? window.__cleanupArrows() : null;"
+
 def clean_up_visual_elements(driver):
     """Remove all custom visual elements from the board"""
+    global last_drawn_position
+    last_drawn_position = None
     try:
-        script = """
-        (function() {
-            // Remove custom arrows
-            const arrowsSvg = document.querySelector('svg.arrows');
-            if (arrowsSvg) {
-                const arrows = arrowsSvg.querySelectorAll('.custom-arrow');
-                arrows.forEach(arrow => arrow.remove());
-            }
-            
-            // Remove custom highlights
-            const highlights = document.querySelectorAll('.custom-highlight');
-            highlights.forEach(highlight => highlight.remove());
-            
-            return true;
-        })();
-        """
-        driver.execute_script(script)
+        if driver.execute_script(CLEANUP_CALL_SCRIPT) is None:
+            # Page was (re)loaded since the helper was installed
+            driver.execute_script(CLEANUP_INSTALL_SCRIPT)
+            driver.execute_script(CLEANUP_CALL_SCRIPT)
     except Exception as e:
         console.print(f"[yellow]Error cleaning visual elements: {e}[/yellow]")
 
+def reload_settings(settings_path):
+    """Re-read the settings file and apply it to args and legit_mode"""
+    global args, legit_mode, last_settings_hash
+    
+    # Read new settings, skipping the parse when the contents did not actually change
+    with open(settings_path, 'rb') as f:
+        data = f.read()
+    content_hash = settings_digest(data)
+    if content_hash == last_settings_hash:
+        return
+    
+    console.print("[blue]Settings file changed, updating parameters...[/blue]")
+    config = yaml.load(data, Loader=YAML_LOADER)
+    
+    # Store previous values to detect changes
+    previous_enabled = args.enabled
+    previous_legit = legit_mode.enabled if hasattr(legit_mode, 'enabled') else False
+    
+    # Build the new values first, then apply each group with a single dict update so
+    # other threads never see e.g. the new enabled flag alongside the old side
+    # (args and legit_mode are shared with the GUI, so they are updated rather than replaced)
+    config_debug = config.get('debug', args.config_debug)
+    vars(args).update({
+        'enabled': config.get('enabled', args.enabled),
+        'side': config.get('side', args.side),
+        'elo': config.get('elo', args.elo),
+        'legit_mode': config.get('legit_mode', args.legit_mode),
+        'blunder_chance': config.get('blunder_chance', args.blunder_chance),
+        'suboptimal_chance': config.get('suboptimal_chance', args.suboptimal_chance),
+        'config_debug': config_debug,
+        'debug': config_debug or os.environ.get('CHESSBOT_DEBUG') == '1',
+        'poll_interval': config.get('poll_interval', args.poll_interval),
+        'tt_size': config.get('tt_size', args.tt_size),
+    })
+    raw_color = config.get('arrow_color', args.arrow_color)
+    
+    # Update legit mode settings
+    vars(legit_mode).update({
+        'enabled': config.get('legit_mode', legit_mode.enabled),
+        'blunder_chance': config.get('blunder_chance', legit_mode.blunder_chance),
+        'suboptimal_chance': config.get('suboptimal_chance', legit_mode.suboptimal_chance),
+        'skill_variance': config.get('skill_variance', legit_mode.skill_variance),
+        'consistency': config.get('consistency', legit_mode.consistency),
+        'elo_variance': config.get('elo_variance', legit_mode.elo_variance),
+    })
+    
+    # Assigning the color also refreshes args.arrow_rgba_str; skip it when already in effect
+    if raw_color != args.arrow_color:
+        args.arrow_color = raw_color
+    
+    # Only mark the contents as applied once they were, so a failed reload is retried
+    last_settings_hash = content_hash
+    
+    # Clear arrows if disabled state changed; the main loop owns the driver and does the clearing
+    if previous_enabled != args.enabled and not args.enabled:
+        console.print("[yellow]Analysis disabled, clearing visual elements...[/yellow]")
+        settings_changed_event.set()
+    
+    # Log legit mode state change
+    if previous_legit != legit_mode.enabled:
+        mode_state = "ENABLED" if legit_mode.enabled else "DISABLED"
+        console.print(f"[green]Legit mode {mode_state}[/green]")
+    
+    console.print(f"[green]Updated settings: enabled={args.enabled}, side={args.side}, elo={args.elo}, legit_mode={legit_mode.enabled}[/green]")
+    args.notify()
+
+class SettingsFileHandler(FileSystemEventHandler):
+    """Reload settings shortly after the last write to the watched file"""
+    def __init__(self, settings_path):
+        super().__init__()
+        self.settings_path = os.path.abspath(settings_path)
+        self.pending = None
+    
+    def on_modified(self, event):
+        self.schedule_reload(event.src_path)
+    
+    def on_created(self, event):
+        self.schedule_reload(event.src_path)
+    
+    def on_moved(self, event):
+        # Editors that save via rename-over land here
+        self.schedule_reload(event.dest_path)
+    
+    def schedule_reload(self, path):
+        if os.path.abspath(path) != self.settings_path:
+            return
+        
+        # Debounce: collapse editor double-writes into one reload after they settle
+        if self.pending:
+            self.pending.cancel()
+        self.pending = threading.Timer(SETTINGS_DEBOUNCE, self.reload)
+        self.pending.daemon = True
+        self.pending.start()
+    
+    def reload(self):
+        try:
+            reload_settings(self.settings_path)
+        except Exception as e:
+            console.print(f"[yellow]Error watching settings file: {e}[/yellow]")
+
 def watch_settings_file(settings_path):
     """Watch the settings file for changes and update args accordingly"""
-    global args, legit_mode
-    
     if not os.path.exists(settings_path):
         console.print(f"[yellow]Settings file not found: {settings_path}[/yellow]")
         return
         
     console.print(f"[green]Watching settings file: {settings_path}[/green]")
+    
+    # Block on OS file events when watchdog is available
+    if Observer is not None:
+        observer = Observer()
+        observer.schedule(SettingsFileHandler(settings_path), os.path.dirname(os.path.abspath(settings_path)))
+        observer.start()
+        observer.join()
+        return
+    
+    # Fall back to polling the modification time
     last_modified = os.path.getmtime(settings_path)
     
     while True:
         try:
             time.sleep(0.5)
             
-            if not os.path.exists(settings_path):
+            # One stat per tick; a missing file (mid-save) just waits for the next one
+            try:
+                current_modified = os.stat(settings_path).st_mtime
+            except FileNotFoundError:
                 continue
-                
-            current_modified = os.path.getmtime(settings_path)
             
             if current_modified > last_modified:
-                console.print("[blue]Settings file changed, updating parameters...[/blue]")
                 last_modified = current_modified
-                
-                # Read new settings
-                with open(settings_path, 'r') as f:
-                    config = yaml.safe_load(f)
-                
-                # Store previous values to detect changes
-                previous_enabled = args.enabled
-                previous_legit = legit_mode.enabled if hasattr(legit_mode, 'enabled') else False
-                
-                # Update args
-                args.enabled = config.get('enabled', args.enabled)
-                args.side = config.get('side', args.side)
-                args.elo = config.get('elo', args.elo)
-                args.arrow_color = config.get('arrow_color', args.arrow_color)
-                
-                # Update legit mode settings
-                legit_mode.enabled = config.get('legit_mode', legit_mode.enabled)
-                legit_mode.blunder_chance = config.get('blunder_chance', legit_mode.blunder_chance)
-                legit_mode.suboptimal_chance = config.get('suboptimal_chance', legit_mode.suboptimal_chance)
-                legit_mode.skill_variance = config.get('skill_variance', legit_mode.skill_variance)
-                legit_mode.consistency = config.get('consistency', legit_mode.consistency)
-                legit_mode.elo_variance = config.get('elo_variance', legit_mode.elo_variance)
-                
-                # Convert hex color to rgba if needed
-                if args.arrow_color.startswith('#'):
-                    r = int(args.arrow_color[1:3], 16)
-                    g = int(args.arrow_color[3:5], 16)
-                    b = int(args.arrow_color[5:7], 16)
-                    args.arrow_color = f"rgba({r}, {g}, {b}, 0.8)"
-                
-                # Clear arrows if disabled state changed
-                if previous_enabled != args.enabled and not args.enabled:
-                    console.print("[yellow]Analysis disabled, clearing visual elements...[/yellow]")
-                
-                # Log legit mode state change
-                if previous_legit != legit_mode.enabled:
-                    mode_state = "ENABLED" if legit_mode.enabled else "DISABLED"
-                    console.print(f"[green]Legit mode {mode_state}[/green]")
-                
-                console.print(f"[green]Updated settings: enabled={args.enabled}, side={args.side}, elo={args.elo}, legit_mode={legit_mode.enabled}[/green]")
+                reload_settings(settings_path)
         
         except Exception as e:
             console.print(f"[yellow]Error watching settings file: {e}[/yellow]")
 
 
+@functools.lru_cache(maxsize=None)
+def build_edge_options(debugger_address=None, profile_dir=None):
+    """Build the Edge options once and reuse them for every driver start"""
+    edge_options = webdriver.EdgeOptions()
+    if debugger_address:
+        # Attach to an Edge already started with --remote-debugging-port instead of launching one;
+        # launch switches and the automation options below do not apply to an attached browser
+        edge_options.add_experimental_option('debuggerAddress', debugger_address)
+        return edge_options
+    
+    # Prevent Edge from asking to sign in and improve automation
+    edge_options.add_argument('--no-sandbox')
+    edge_options.add_argument('--disable-dev-shm-usage')
+    edge_options.add_argument('--disable-blink-features=AutomationControlled')
+    edge_options.add_argument('--disable-extensions')
+    edge_options.add_argument('--disable-notifications')
+    edge_options.add_argument('--disable-popup-blocking')
+    edge_options.add_argument('--ignore-certificate-errors')
+    edge_options.add_argument('--ignore-ssl-errors')
+    if profile_dir:
+        # Opt-in persistent profile so the chess.com login, cookies and HTTP cache survive restarts;
+        # Edge locks it, so only one bot at a time can use a given directory
+        edge_options.add_argument(f'--user-data-dir={profile_dir}')
+    # Add experimental options to prevent detection
+    edge_options.add_experimental_option('excludeSwitches', ['enable-automation'])
+    edge_options.add_experimental_option('useAutomationExtension', False)
+    return edge_options
+
+# Shared WebDriverWait objects keyed by (driver id, timeout)
+driver_waits = {}
+
+def get_wait(driver, timeout):
+    """Return a reusable WebDriverWait for this driver and timeout"""
+    key = (id(driver), timeout)
+    wait = driver_waits.get(key)
+    if wait is None:
+        # Poll much faster than the 0.5s default so the board is picked up promptly
+        wait = WebDriverWait(driver, timeout, poll_frequency=0.05,
+                             ignored_exceptions=(StaleElementReferenceException, NoSuchElementException))
+        driver_waits[key] = wait
+    return wait
+
+# Resolves as soon as the selector appears in the DOM, driven by a MutationObserver
+# in the page instead of WebDriver polling; resolves false once the timeout passes
+BOARD_READY_SCRIPT = """
+const selector = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+if (document.querySelector(selector)) return done(true);
+const observer = new MutationObserver(() => {
+    if (document.querySelector(selector)) {
+        observer.disconnect();
+        clearTimeout(timer);
+        done(true);
+    }
+});
+const timer = setTimeout(() => { observer.disconnect(); done(false); }, timeoutMs);
+observer.observe(document.documentElement, {childList: true, subtree: true});
+"""
+
 def wait_for_page_load(driver, timeout=10):
     """Wait for the chess board to load"""
+    selector = 'wc-chess-board.board'
+    try:
+        driver.set_script_timeout(timeout + 1)
+        if driver.execute_async_script(BOARD_READY_SCRIPT, selector, int(timeout * 1000)):
+            return True
+        console.print("[red]Timed out waiting for chess board to load[/red]")
+        return False
+    except WebDriverException:
+        # Page still navigating or async scripts unavailable: fall back to polling
+        pass
+    
     try:
-        WebDriverWait(driver, timeout).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, 'wc-chess-board.board'))
+        get_wait(driver, timeout).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, selector))
         )
         return True
     except TimeoutException:
@@ -1065,27 +1377,49 @@ def handle_keyboard_input(driver):
     except Exception as e:
         console.print(f"[red]Error setting up keyboard handlers: {e}[/red]")
 
+BOARD_ALIVE_SCRIPT = "return !!document.querySelector('wc-chess-board.board');"
+
+def recover_page(driver):
+    """Reload the page only if the board is gone; otherwise just reinstall the page helpers"""
+    if driver.execute_script(BOARD_ALIVE_SCRIPT):
+        driver.execute_script(CLEANUP_INSTALL_SCRIPT)
+        return
+    
+    driver.refresh()
+    wait_for_page_load(driver)
+    driver.execute_script(CLEANUP_INSTALL_SCRIPT)
+    handle_keyboard_input(driver)
+
+# Read and reset both keyboard event flags in one round trip: bit 1 = side change, bit 2 = legit toggle
+BROWSER_EVENTS_SCRIPT = """
+const flags = (window.chessSideChanged === true ? 1 : 0) | (window.legitModeToggled === true ? 2 : 0);
+window.chessSideChanged = false;
+window.legitModeToggled = false;
+return flags;
+"""
+
 def check_browser_events(driver):
     """Check and handle browser events"""
     global args, legit_mode
     
     try:
+        flags = driver.execute_script(BROWSER_EVENTS_SCRIPT)
+        if not flags:
+            return
+        
         # Check for side change event
-        side_changed = driver.execute_script("return window.chessSideChanged === true;")
-        if side_changed:
+        if flags & 1:
             args.side = 'black' if args.side == 'white' else 'white'
             console.print(f"[green]Switched analysis side to: {args.side}[/green]")
-            args.save_config()
-            driver.execute_script("window.chessSideChanged = false;")
         
         # Check for legit mode toggle event
-        legit_toggled = driver.execute_script("return window.legitModeToggled === true;")
-        if legit_toggled:
+        if flags & 2:
             args.legit_mode = not args.legit_mode
             legit_mode.enabled = args.legit_mode
             console.print(f"[green]Legit mode {'enabled' if args.legit_mode else 'disabled'}[/green]")
-            args.save_config()
-            driver.execute_script("window.legitModeToggled = false;")
+        
+        args.save_config()
+        args.notify()
             
     except Exception as e:
         console.print(f"[yellow]Error checking browser events: {e}[/yellow]")
@@ -1101,26 +1435,16 @@ def main():
 
     def initialize_driver():
         """Initialize Chrome driver with custom options"""
-        edge_options = webdriver.EdgeOptions()
-        # Prevent Edge from asking to sign in and improve automation
-        edge_options.add_argument('--no-sandbox')
-        edge_options.add_argument('--disable-dev-shm-usage')
-        edge_options.add_argument('--disable-blink-features=AutomationControlled')
-        edge_options.add_argument('--disable-extensions')
-        edge_options.add_argument('--disable-notifications')
-        edge_options.add_argument('--disable-popup-blocking')
-        edge_options.add_argument('--ignore-certificate-errors')
-        edge_options.add_argument('--ignore-ssl-errors')
-        # Add experimental options to prevent detection
-        edge_options.add_experimental_option('excludeSwitches', ['enable-automation'])
-        edge_options.add_experimental_option('useAutomationExtension', False)
-        
         try:
-            driver = webdriver.Edge(options=edge_options)
+            driver = webdriver.Edge(options=build_edge_options(args.debugger_address, args.edge_profile_dir))
+            
+            # An attached browser is already logged in; keep whatever game its tab has open
+            if args.debugger_address:
+                print(f"Attached to Edge at {args.debugger_address}")
+                return driver
             
             # Open a blank page first
             driver.get('about:blank')
-            time.sleep(2)  # Short wait for browser to stabilize
             
             # Now open chess.com
             print("Opening chess.com - please log in if needed...")
@@ -1161,8 +1485,9 @@ def main():
         return
     
     try:
-        print("[STARTING] Opening chess.com...")
-        driver.get('https://www.chess.com/play/computer')
+        if not args.debugger_address:
+            print("[STARTING] Opening chess.com...")
+            driver.get('https://www.chess.com/play/computer')
         
         # Wait for page to load
         print("Waiting for page to load...")
@@ -1173,27 +1498,15 @@ def main():
         print("Chess board loaded successfully!")
         
         # Add keyboard shortcut handler for cleaning up visual elements
-        script = """
-        document.addEventListener('keydown', function(e) {
-            // Press 'c' to clean up visual elements
-            if (e.key === 'c') {
-                // Clean up function
-                const arrowsSvg = document.querySelector('svg.arrows');
-                if (arrowsSvg) {
-                    const arrows = arrowsSvg.querySelectorAll('.custom-arrow');
-                    arrows.forEach(arrow => arrow.remove());
-                }
-                
-                const highlights = document.querySelectorAll('.custom-highlight');
-                highlights.forEach(highlight => highlight.remove());
-            }
-        });
-        """
-        driver.execute_script(script)
+        driver.execute_script(CLEANUP_INSTALL_SCRIPT)
         
         # Set up keyboard handlers
         handle_keyboard_input(driver)
         
+        # Start the background analysis worker
+        if engine:
+            threading.Thread(target=analysis_worker, args=(driver,), daemon=True).start()
+        
         print("Ready! Press 'c' at any time to clear visual elements.")
         print("Monitoring game state...")
         
@@ -1203,11 +1516,19 @@ def main():
         last_error_type = None
         last_error_time = time.time()
         refresh_cooldown = 30  # Seconds between page refreshes
+        poll_interval = args.poll_interval
         
         # Main monitoring loop with improved error handling
         while True:
+            changed = True
             try:
-                monitor_board_state(driver)
+                with driver_lock:
+                    # Apply settings changes announced by the watcher thread
+                    if settings_changed_event.is_set():
+                        settings_changed_event.clear()
+                        if not args.enabled:
+                            clean_up_visual_elements(driver)
+                    changed = monitor_board_state(driver)
                 
                 # Reset consecutive error counter on successful execution
                 consecutive_errors = 0
@@ -1221,13 +1542,11 @@ def main():
                 
                 last_error_type = "stale_element"
                 
-                # If we've had too many consecutive errors of same type, consider refresh
-                if consecutive_errors >= 3 and (current_time - last_error_time) > refresh_cooldown:
-                    console.print("[bold yellow]Multiple stale element errors detected. Attempting to refresh page...[/bold yellow]")
+                # If we've spent too long backing off on the same error, consider refresh
+                if consecutive_errors * error_backoff(consecutive_errors) > ERROR_REFRESH_THRESHOLD and (current_time - last_error_time) > refresh_cooldown:
+                    console.print("[bold yellow]Multiple stale element errors detected. Recovering page...[/bold yellow]")
                     try:
-                        driver.refresh()
-                        time.sleep(2)  # Wait for refresh
-                        wait_for_page_load(driver)
+                        recover_page(driver)
                         consecutive_errors = 0
                         last_error_time = current_time
                     except Exception as refresh_error:
@@ -1235,35 +1554,32 @@ def main():
                         
             except TimeoutException as te:
                 timeout_count += 1
+                consecutive_errors += 1
                 console.print(f"[yellow]Timeout error (#{timeout_count}): {str(te)}[/yellow]")
                 
                 # If we have too many timeouts, refresh the page
                 if timeout_count >= 3:
-                    console.print("[bold yellow]Multiple timeouts detected. Attempting to refresh page...[/bold yellow]")
+                    console.print("[bold yellow]Multiple timeouts detected. Recovering page...[/bold yellow]")
                     try:
-                        driver.refresh()
-                        time.sleep(2)  # Wait for refresh
-                        wait_for_page_load(driver)
+                        recover_page(driver)
                         timeout_count = 0
+                        consecutive_errors = 0
                     except Exception as refresh_error:
                         console.print(f"[red]Error refreshing: {refresh_error}[/red]")
                 
             except Exception as e:
                 crash_count += 1
+                consecutive_errors += 1
                 console.print(f"[bold red]Error in monitoring loop (count: {crash_count}): {str(e)}[/bold red]")
-                console.print(f"[red]Error type: {type(e).__name__}[/red]")
-                
-                # Print full traceback for better debugging
-                console.print(f"[dim red]{traceback.format_exc()}[/dim red]")
+                print_error_details(e)
                 
                 # If we've had too many consecutive errors or total crashes is high, restart the driver
                 if crash_count >= max_crashes:
-                    console.print("[bold yellow]Too many errors detected. Refreshing page...[/bold yellow]")
+                    console.print("[bold yellow]Too many errors detected. Recovering page...[/bold yellow]")
                     try:
-                        driver.refresh()
-                        time.sleep(2)  # Wait for refresh
-                        wait_for_page_load(driver)
+                        recover_page(driver)
                         crash_count = 0
+                        consecutive_errors = 0
                     except Exception as refresh_error:
                         console.print(f"[red]Error refreshing: {refresh_error}[/red]")
                         
@@ -1272,18 +1588,28 @@ def main():
                             console.print("[bold red]Critical error threshold reached. Reopening chess.com...[/bold red]")
                             try:
                                 driver.get('https://www.chess.com/play/computer')
-                                time.sleep(3)  # Wait longer for complete reload
                                 wait_for_page_load(driver)
                                 crash_count = 0
-                                previous_board_state = {}  # Reset board state
+                                previous_board_state.clear()  # Reset board state
                             except Exception as reopen_error:
                                 console.print(f"[red]Error reopening chess.com: {reopen_error}[/red]")
             
             # Check for browser events instead of terminal input
-            check_browser_events(driver)
+            with driver_lock:
+                check_browser_events(driver)
             
-            # Use a short sleep to avoid CPU overload but maintain responsiveness
-            time.sleep(0.2)
+            # Back off exponentially (with jitter) while errors keep happening
+            errors = max(consecutive_errors, crash_count)
+            if errors:
+                time.sleep(error_backoff(errors) + random.uniform(0, ERROR_BACKOFF_JITTER))
+                continue
+            
+            # Poll quickly right after a change and back off while the board is idle
+            if changed:
+                poll_interval = args.poll_interval
+            else:
+                poll_interval = min(max(POLL_MAX, args.poll_interval), poll_interval * POLL_BACKOFF)
+            time.sleep(poll_interval)
             
     except KeyboardInterrupt:
         console.print("[yellow]Keyboard interrupt detected. Cleaning up...[/yellow]")
@@ -1307,21 +1633,20 @@ def main():
                 console.print(f"[red]Error during cleanup: {e}[/red]")
 
 def launch_settings_window():
-    """Launch the settings GUI in a separate thread"""
-    from settings_gui import create_settings_window
-    
-    def run_gui():
-        app = create_settings_window(config=args, legit_mode=legit_mode)
-        app.root.mainloop()
+    """Open another settings window as a Toplevel of the running settings window"""
+    if not settings_window:
+        console.print("[yellow]No settings window is running[/yellow]")
+        return
     
-    settings_thread = threading.Thread(target=run_gui, daemon=True)
-    settings_thread.start()
+    # Tk may only be used from the thread that owns the root, so let its mainloop build the window;
+    # the module-qualified name: this file defines its own create_settings_window()
+    root = settings_window.root
+    root.after(0, lambda: settings_gui.create_settings_window(config=args, legit_mode=legit_mode, master=root))
 
 def create_settings_window():
     global settings_window, args, legit_mode
-    root = tk.Tk()
-    settings_window = ChessSettingsGUI(root, args, legit_mode)
-    return root
+    settings_window = settings_gui.create_settings_window(config=args, legit_mode=legit_mode)
+    return settings_window.root
 
 if __name__ == "__main__":
     # Create settings window
@@ -1,10 +1,12 @@
 import tkinter as tk
 from tkinter import ttk, colorchooser
-import yaml
-from dataclasses import asdict
-import os
+import queue
+import collections
 import threading
 
+# Most moves kept in the moves display; older lines are dropped
+MAX_MOVE_LINES = 500
+
 class ChessSettingsGUI:
     def __init__(self, root, config=None, legit_mode=None):
         self.root = root
@@ -15,6 +17,26 @@ class ChessSettingsGUI:
         self.config = config
         self.legit_mode = legit_mode
         
+        # Pending debounced update from slider motion
+        self._pending_after = None
+        
+        # Widget values as of the last applied update, to skip redundant saves
+        self._last_snapshot = None
+        
+        # Set while update_from_config fills the widgets, so their callbacks don't save
+        self._loading = False
+        
+        # Set when a widget asked for an update that the next idle slice has not applied yet
+        self._dirty = False
+        
+        # Moves waiting to be written to the moves display in one batch
+        self._move_buf = collections.deque()
+        self._move_flush_pending = False
+        
+        # Settings are written by a background thread so widget events never wait on disk
+        self._save_queue = queue.Queue()
+        threading.Thread(target=self._save_worker, daemon=True).start()
+        
         # Create main container
         container = ttk.Frame(root)
         container.grid(row=0, column=0, sticky="nsew")
@@ -47,10 +69,12 @@ class ChessSettingsGUI:
         ttk.Radiobutton(side_frame, text="Black", variable=self.side_var, value="black", 
                        command=self.update_settings).pack(side=tk.LEFT, padx=5)
         
-        # ELO Rating with validation
+        # ELO Rating with validation (only digits can be typed)
         ttk.Label(settings_frame, text="ELO Rating:", font=('Helvetica', 10)).grid(row=3, column=0, sticky=tk.W, pady=5)
         self.elo_var = tk.StringVar(value=str(self.config.elo if self.config else 2000))
-        elo_entry = ttk.Entry(settings_frame, textvariable=self.elo_var, width=10)
+        elo_validate = (self.root.register(lambda text: text == "" or text.isdigit()), '%P')
+        elo_entry = ttk.Entry(settings_frame, textvariable=self.elo_var, width=10,
+                              validate='key', validatecommand=elo_validate)
         elo_entry.grid(row=3, column=1, sticky=tk.W)
         elo_entry.bind('<Return>', lambda e: self.update_settings())
         
@@ -78,15 +102,17 @@ class ChessSettingsGUI:
         ttk.Label(settings_frame, text="Blunder Chance (%):", font=('Helvetica', 10)).grid(row=8, column=0, sticky=tk.W, pady=5)
         self.blunder_var = tk.DoubleVar(value=float(self.config.blunder_chance if self.config else 0.15) * 100)
         blunder_slider = ttk.Scale(settings_frame, from_=0, to=100, variable=self.blunder_var, 
-                                 command=lambda _: self.update_settings())
+                                 command=self._schedule_update)
         blunder_slider.grid(row=8, column=1, sticky="ew", pady=5)
+        blunder_slider.bind('<ButtonRelease-1>', self._flush_update)
         
         # Suboptimal Chance with slider
         ttk.Label(settings_frame, text="Suboptimal Chance (%):", font=('Helvetica', 10)).grid(row=9, column=0, sticky=tk.W, pady=5)
         self.suboptimal_var = tk.DoubleVar(value=float(self.config.suboptimal_chance if self.config else 0.35) * 100)
         suboptimal_slider = ttk.Scale(settings_frame, from_=0, to=100, variable=self.suboptimal_var, 
-                                    command=lambda _: self.update_settings())
+                                    command=self._schedule_update)
         suboptimal_slider.grid(row=9, column=1, sticky="ew", pady=5)
+        suboptimal_slider.bind('<ButtonRelease-1>', self._flush_update)
         
         # Status Label with improved styling
         self.status_label = ttk.Label(settings_frame, text="", font=('Helvetica', 9, 'italic'))
@@ -99,13 +125,22 @@ class ChessSettingsGUI:
         # Configure styles
         self.configure_styles()
         
-        # Start periodic update
+        # Fill the widgets now and again whenever the settings change elsewhere
+        # (config file edits, browser hotkeys); there is no polling
         self.update_from_config()
+        if self.config:
+            self.config.listeners.append(self._on_config_changed)
     
     def configure_styles(self):
-        style = ttk.Style()
+        # The style database belongs to the Tk interpreter, so configure it once per interpreter;
+        # the flag lives on the interpreter's Tk root, which every Toplevel shares
+        interpreter_root = self.root._root()
+        if getattr(interpreter_root, '_chess_styles_configured', False):
+            return
+        style = ttk.Style(interpreter_root)
         style.configure('Accent.TButton', font=('Helvetica', 10, 'bold'))
         style.configure('Switch.TCheckbutton', font=('Helvetica', 10))
+        interpreter_root._chess_styles_configured = True
     
     def choose_color(self):
         color = colorchooser.askcolor(color=self.arrow_color)
@@ -118,45 +153,143 @@ class ChessSettingsGUI:
         self.color_preview.delete("all")
         self.color_preview.create_rectangle(0, 0, 20, 20, fill=self.arrow_color, outline="")
     
+    def _schedule_update(self, _=None):
+        """Apply slider changes once the slider has settled instead of on every motion"""
+        if self._pending_after:
+            self.root.after_cancel(self._pending_after)
+        self._pending_after = self.root.after(150, self._flush_update)
+    
+    def _flush_update(self, _=None):
+        """Apply a pending slider change immediately"""
+        if self._pending_after:
+            self.root.after_cancel(self._pending_after)
+            self._pending_after = None
+            self.update_settings()
+    
     def update_settings(self):
+        """Apply the widget values once the current burst of widget events is handled"""
+        if self._loading or self._dirty:
+            return
+        self._dirty = True
+        self.root.after_idle(self._maybe_flush)
+    
+    def _maybe_flush(self):
+        """Apply a pending update requested since the last idle slice"""
+        if self._dirty:
+            self._dirty = False
+            self._do_update_settings()
+    
+    def _do_update_settings(self):
+        # Without a config there is nothing to apply the widget values to
+        if not self.config:
+            return
+        
         try:
-            # Update config object
-            self.config.enabled = self.enabled_var.get()
-            self.config.side = self.side_var.get()
-            self.config.elo = int(self.elo_var.get())
-            self.config.arrow_color = self.arrow_color
-            self.config.legit_mode = self.legit_mode_var.get()
-            self.config.blunder_chance = float(self.blunder_var.get()) / 100
-            self.config.suboptimal_chance = float(self.suboptimal_var.get()) / 100
+            # Read every widget once; each .get() is a round-trip into Tcl
+            enabled = self.enabled_var.get()
+            side = self.side_var.get()
+            elo_text = self.elo_var.get()
+            legit = self.legit_mode_var.get()
+            blunder = self.blunder_var.get()
+            suboptimal = self.suboptimal_var.get()
+            
+            # Nothing to do if the widgets still hold what was last applied;
+            # rounding folds sub-pixel slider jitter into one value
+            snapshot = (enabled, side, elo_text, self.arrow_color, legit, round(blunder, 2), round(suboptimal, 2))
+            if snapshot == self._last_snapshot:
+                return
+            
+            blunder_chance = blunder / 100
+            suboptimal_chance = suboptimal / 100
+            
+            # Update config object; the entry only accepts digits, so an empty field keeps the current ELO.
+            # Under the config's lock, so a save running on another thread never sees half of it
+            with self.config.lock:
+                self.config.enabled = enabled
+                self.config.side = side
+                self.config.elo = int(elo_text) if elo_text else self.config.elo
+                self.config.arrow_color = self.arrow_color
+                self.config.legit_mode = legit
+                self.config.blunder_chance = blunder_chance
+                self.config.suboptimal_chance = suboptimal_chance
             
             # Update legit mode settings
             if self.legit_mode:
-                self.legit_mode.enabled = self.legit_mode_var.get()
-                self.legit_mode.blunder_chance = float(self.blunder_var.get()) / 100
-                self.legit_mode.suboptimal_chance = float(self.suboptimal_var.get()) / 100
+                self.legit_mode.enabled = legit
+                self.legit_mode.blunder_chance = blunder_chance
+                self.legit_mode.suboptimal_chance = suboptimal_chance
             
-            # Save to file
-            self.config.save_config()
+            # Save to file in the background; _show_save_result reports how the write went
+            self._save_queue.put(self.config)
+            self._last_snapshot = snapshot
             
-            self.status_label.config(text="Settings updated successfully!", foreground="green")
+            self.status_label.config(text="Saving settings...", foreground="gray")
         except Exception as e:
+            # Runs from an after_idle callback, so errors would otherwise only reach stderr
             self.status_label.config(text=f"Error updating settings: {str(e)}", foreground="red")
     
+    def _save_worker(self):
+        """Write queued configs to disk, skipping saves already superseded by a newer one"""
+        while True:
+            config = self._save_queue.get()
+            try:
+                while True:
+                    config = self._save_queue.get_nowait()
+            except queue.Empty:
+                pass
+            saved = config.save_config()
+            
+            # Tk widgets belong to the GUI thread, so hand the result back to it
+            try:
+                self.root.after(0, self._show_save_result, saved)
+            except (RuntimeError, tk.TclError):
+                pass  # Window already closed
+    
+    def _show_save_result(self, saved):
+        """Show whether the last background save reached the disk"""
+        if saved:
+            self.status_label.config(text="Settings updated successfully!", foreground="green")
+        else:
+            # The save failed, so the next update must write again even if nothing else changed
+            self._last_snapshot = None
+            self.status_label.config(text="Error saving settings (see console)", foreground="red")
+    
+    def _on_config_changed(self):
+        """Refresh the widgets on the Tk thread after an outside settings change"""
+        self.root.after(0, self.update_from_config)
+    
     def update_from_config(self):
         if not self.config:
             return
-            
-        self.enabled_var.set(self.config.enabled)
-        self.side_var.set(self.config.side)
-        self.elo_var.set(str(self.config.elo))
-        self.arrow_color = self.config.arrow_color
-        self.update_color_preview()
-        self.legit_mode_var.set(self.config.legit_mode)
-        self.blunder_var.set(str(float(self.config.blunder_chance) * 100))
-        self.suboptimal_var.set(str(float(self.config.suboptimal_chance) * 100))
+        
+        self._loading = True
+        try:
+            self.enabled_var.set(self.config.enabled)
+            self.side_var.set(self.config.side)
+            self.elo_var.set(str(self.config.elo))
+            self.arrow_color = self.config.arrow_color
+            self.update_color_preview()
+            self.legit_mode_var.set(self.config.legit_mode)
+            self.blunder_var.set(float(self.config.blunder_chance) * 100)
+            self.suboptimal_var.set(float(self.config.suboptimal_chance) * 100)
+        finally:
+            self._loading = False
+        
+        # The widgets now mirror the config, not the last update applied from them
+        self._last_snapshot = None
     
     def add_move(self, move_text):
         """Add a move to the GUI display"""
+        # Buffer the move; a scheduled flush writes everything queued since in one insert
+        self._move_buf.append(move_text)
+        if not self._move_flush_pending:
+            self._move_flush_pending = True
+            self.root.after(50, self._flush_moves)
+    
+    def _flush_moves(self):
+        """Write all buffered moves to the GUI display"""
+        self._move_flush_pending = False
+        
         # Create a moves display area if it doesn't exist
         if not hasattr(self, 'moves_text'):
             # Create a frame for moves
@@ -176,13 +309,25 @@ class ChessSettingsGUI:
             self.root.grid_rowconfigure(1, weight=1)
             moves_frame.grid_columnconfigure(0, weight=1)
         
-        # Add the move to the text widget
-        self.moves_text.insert(tk.END, move_text + "\n")
-        self.moves_text.see(tk.END)  # Auto-scroll to the latest move
+        # Add the buffered moves to the text widget
+        moves = []
+        while self._move_buf:
+            moves.append(self._move_buf.popleft())
+        if moves:
+            self.moves_text.insert(tk.END, "\n".join(moves) + "\n")
+            
+            # Trim the oldest moves so redraws and scrolling stay cheap in long sessions
+            # (the text always ends with a newline, so the last index is one line past the moves)
+            excess = int(self.moves_text.index('end-1c').split('.')[0]) - 1 - MAX_MOVE_LINES
+            if excess > 0:
+                self.moves_text.delete('1.0', f'{excess + 1}.0')
+            
+            self.moves_text.see(tk.END)  # Auto-scroll to the latest move
 
-def create_settings_window(config, legit_mode):
-    """Create and return a settings window instance"""
-    root = tk.Tk()
+def create_settings_window(config, legit_mode, master=None):
+    """Create and return a settings window instance; with a master, call it on master's thread"""
+    # Open further windows on the running Tk interpreter instead of starting another one
+    root = tk.Toplevel(master) if master is not None else tk.Tk()
     return ChessSettingsGUI(root, config=config, legit_mode=legit_mode)
 
 if __name__ == "__main__":
@@ -196,9 +341,11 @@ if __name__ == "__main__":
             self.legit_mode = True
             self.blunder_chance = 0.15
             self.suboptimal_chance = 0.35
+            self.listeners = []
+            self.lock = threading.Lock()
             
         def save_config(self):
-            pass
+            return True
     
     root = tk.Tk()
     app = ChessSettingsGUI(root, config=MockConfig())